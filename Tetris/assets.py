@@ -0,0 +1,103 @@
+import io
+import os
+import threading
+
+import pygame
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Ressources du jeu : clé -> fichier (None : police par défaut de pygame)
+FONTS = {"default": None}
+SOUNDS = {}
+MUSIC = {"theme": "tetris_theme.mp3"}
+
+# Événement envoyé quand le préchargement en arrière-plan est terminé
+ASSETS_LOADED = pygame.event.custom_type()
+
+class AssetRegistry:
+    # Registre partagé par tout le processus : polices, sons et musique sont
+    # chargés à leur première utilisation puis gardés en cache sous leur clé.
+    # preload() lit les fichiers sur un fil d'arrière-plan ; les objets pygame
+    # sont créés dans le fil principal (SDL_ttf et SDL_mixer n'aiment pas être
+    # appelés depuis plusieurs fils), à partir du contenu déjà en mémoire.
+    def __init__(self, base_dir=HERE):
+        self.base_dir = base_dir
+        self.data = {}  # Contenu des fichiers déjà lus, par clé
+        self.fonts = {}
+        self.sounds = {}
+        self.release_registered = False
+        self.lock = threading.Lock()
+        self.preload_thread = None
+
+    def read(self, kind, name):
+        # Contenu du fichier de la ressource (lu sur le disque une seule fois)
+        key = (kind, name)
+        with self.lock:
+            data = self.data.get(key)
+        if data is None:
+            filename = {"font": FONTS, "sound": SOUNDS, "music": MUSIC}[kind][name]
+            with open(os.path.join(self.base_dir, filename), "rb") as file:
+                data = file.read()
+            with self.lock:
+                self.data[key] = data
+        return data
+
+    def font(self, size, name="default"):
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            if FONTS[name] is None:
+                font = pygame.font.Font(None, size)
+            else:
+                font = pygame.font.Font(io.BytesIO(self.read("font", name)), size)
+            self.register_release()
+            self.fonts[key] = font
+        return font
+
+    def sound(self, name):
+        sound = self.sounds.get(name)
+        if sound is None:
+            sound = pygame.mixer.Sound(io.BytesIO(self.read("sound", name)))
+            self.register_release()
+            self.sounds[name] = sound
+        return sound
+
+    def register_release(self):
+        # Les polices et les sons ne survivent pas à pygame.quit() : les
+        # oublier à ce moment-là (pygame n'appelle chaque fonction qu'une fois)
+        if not self.release_registered:
+            pygame.register_quit(self.release)
+            self.release_registered = True
+
+    def release(self):
+        # Le contenu des fichiers reste en mémoire
+        self.fonts.clear()
+        self.sounds.clear()
+        self.release_registered = False
+
+    def play_music(self, name, volume=1.0, loops=-1):
+        # La musique est lue en continu depuis la mémoire (pygame.error ou
+        # OSError si le fichier est absent ou illisible)
+        pygame.mixer.music.load(io.BytesIO(self.read("music", name)), os.path.splitext(MUSIC[name])[1][1:])
+        pygame.mixer.music.set_volume(volume)
+        pygame.mixer.music.play(loops)
+
+    def preload(self):
+        # Lire tous les fichiers en arrière-plan (une seule fois), puis
+        # prévenir la boucle d'événements avec ASSETS_LOADED
+        if self.preload_thread is None:
+            self.preload_thread = threading.Thread(target=self.preload_files, daemon=True)
+            self.preload_thread.start()
+
+    def preload_files(self):
+        for kind, files in (("font", FONTS), ("sound", SOUNDS), ("music", MUSIC)):
+            for name, filename in files.items():
+                if filename is None:
+                    continue
+                try:
+                    self.read(kind, name)
+                except OSError:
+                    pass  # L'erreur sera signalée à la première utilisation
+        pygame.event.post(pygame.event.Event(ASSETS_LOADED))
+
+ASSETS = AssetRegistry()
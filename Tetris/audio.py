@@ -0,0 +1,97 @@
+import sys
+import threading
+import time
+
+import pygame
+
+from assets import ASSETS
+
+# Événement envoyé quand l'initialisation du mixer est terminée (réussie ou non)
+AUDIO_READY = pygame.event.custom_type()
+
+class NullAudio:
+    # Pas de son (--no-audio, ou aucun périphérique audio) : tout est ignoré
+    available = False
+    error = None
+
+    def start(self):
+        pass
+
+    def play_music(self, name, volume=1.0, loops=-1):
+        pass
+
+    def play_sound(self, name):
+        pass
+
+    def play_pending(self):
+        pass
+
+class Audio:
+    # Le mixer est initialisé sur un fil d'arrière-plan, après la première
+    # image : son ouverture peut bloquer plusieurs secondes ou échouer sans
+    # carte son. Seul mixer.init() tourne sur ce fil : il envoie AUDIO_READY
+    # à la fin, et la boucle d'événements appelle play_pending() pour lancer,
+    # dans le fil principal, une musique demandée trop tôt. En cas d'échec,
+    # Audio se comporte comme NullAudio. on_ready(audio) est appelé (depuis
+    # le fil) à la fin.
+    def __init__(self, assets=ASSETS, on_ready=None):
+        self.assets = assets
+        self.on_ready = on_ready
+        self.lock = threading.Lock()
+        self.thread = None
+        self.ready = False
+        self.available = False
+        self.error = None
+        self.ready_ns = None  # Durée de l'initialisation du mixer
+        self.music = None  # Musique demandée avant que le mixer soit prêt
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.init_mixer, daemon=True)
+            self.thread.start()
+
+    def init_mixer(self):
+        start = time.perf_counter_ns()
+        try:
+            pygame.mixer.init()
+            available = True
+        except pygame.error as error:
+            available = False
+            self.error = str(error)
+        self.ready_ns = time.perf_counter_ns() - start
+
+        with self.lock:
+            self.ready = True
+            self.available = available
+            if not available:
+                self.music = None
+        if self.error:
+            print("Son désactivé : %s" % self.error, file=sys.stderr)
+        if self.on_ready is not None:
+            self.on_ready(self)
+        pygame.event.post(pygame.event.Event(AUDIO_READY))
+
+    def play_pending(self):
+        # Fil principal, à la réception de AUDIO_READY
+        with self.lock:
+            music, self.music = self.music, None
+        if music is not None and self.available:
+            self.load_music(*music)
+
+    def play_music(self, name, volume=1.0, loops=-1):
+        with self.lock:
+            if not self.ready:
+                self.music = (name, volume, loops)
+                return
+        if self.available:
+            self.load_music(name, volume, loops)
+
+    def load_music(self, name, volume, loops):
+        try:
+            self.assets.play_music(name, volume, loops)
+        except (pygame.error, OSError) as error:
+            print("Erreur de chargement de la musique %r : %s" % (name, error), file=sys.stderr)
+
+    def play_sound(self, name):
+        if self.available:
+            self.assets.sound(name).play()
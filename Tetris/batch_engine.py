@@ -0,0 +1,210 @@
+import numpy as np
+
+from constants import GRID_WIDTH, GRID_HEIGHT
+from orientations import ORIENTATIONS, PIECE_NAMES
+from tetris_engine import (
+    SCORE_MULTIPLIERS, LINES_PER_LEVEL, GRAVITY_TABLE, GRAVITY_ONE, gravity_for_level
+)
+
+# Moteur vectorisé : fait avancer N parties indépendantes en un seul appel
+# (entraînement RL, évaluation Monte Carlo). Chaque plateau est un tableau
+# de lignes en bitmask, comme TetrisEngine.rows. Un pas correspond à un tick
+# de Simulation : les actions, puis la gravité de TetrisEngine.tick.
+
+# Actions possibles pour chaque partie
+NOOP, LEFT, RIGHT, ROTATE, DOWN, HARD_DROP = range(6)
+
+# Colonnes de mur de chaque côté de la grille et lignes de sol sous la grille :
+# une pièce qui sort de la grille touche toujours un bit déjà rempli
+PAD = 4
+FLOOR_ROWS = 4
+WALLS = ((1 << (GRID_WIDTH + 2 * PAD)) - 1) & ~(((1 << GRID_WIDTH) - 1) << PAD)
+SOLID_ROW = (1 << (GRID_WIDTH + 2 * PAD)) - 1
+
+SPAWN_X = GRID_WIDTH // 2 - 1
+PREVIEW_LENGTH = 3
+
+# Masques des pièces : MASKS[pièce, rotation, dy], bit x = colonne x de la boîte
+MASKS = np.zeros((len(PIECE_NAMES), 4, 4), dtype=np.uint32)
+for _index, _name in enumerate(PIECE_NAMES):
+    for _rotation, _orientation in enumerate(ORIENTATIONS[_name]):
+        for _x, _y in _orientation.cells:
+            MASKS[_index, _rotation, _y] |= 1 << _x
+
+# Tables des règles de TetrisEngine.clear_lines / level_up
+LINE_SCORES = np.array([SCORE_MULTIPLIERS[n] for n in range(5)], dtype=np.int64)
+GRAVITIES = np.array(GRAVITY_TABLE, dtype=np.int64)
+
+class BatchTetrisEngine:
+    def __init__(self, count, seed=None):
+        self.count = count
+        self.rng = np.random.default_rng(seed)
+
+        self.board = np.empty((count, GRID_HEIGHT + FLOOR_ROWS), dtype=np.uint32)
+        self.piece = np.zeros(count, dtype=np.int64)
+        self.rotation = np.zeros(count, dtype=np.int64)
+        self.x = np.zeros(count, dtype=np.int64)
+        self.y = np.zeros(count, dtype=np.int64)
+        self.next_pieces = np.zeros((count, PREVIEW_LENGTH), dtype=np.int64)
+
+        self.score = np.zeros(count, dtype=np.int64)
+        self.total_lines_cleared = np.zeros(count, dtype=np.int64)
+        self.level = np.ones(count, dtype=np.int64)
+        self.lines_to_next_level = np.full(count, LINES_PER_LEVEL, dtype=np.int64)
+        self.gravity = np.full(count, gravity_for_level(1), dtype=np.int64)
+        self.gravity_acc = np.zeros(count, dtype=np.int64)
+        self.game_over = np.zeros(count, dtype=bool)
+
+        self.reset()
+
+    def reset(self, games=None):
+        # Réinitialiser toutes les parties, ou seulement celles indiquées
+        # (masque booléen ou indices), par exemple celles qui sont finies
+        if games is None:
+            games = np.arange(self.count)
+        games = np.asarray(games)
+        if games.dtype == bool:
+            games = np.flatnonzero(games)
+
+        self.board[games, :GRID_HEIGHT] = WALLS
+        self.board[games, GRID_HEIGHT:] = SOLID_ROW
+        self.next_pieces[games] = self.rng.integers(
+            len(PIECE_NAMES), size=(len(games), PREVIEW_LENGTH))
+
+        self.score[games] = 0
+        self.total_lines_cleared[games] = 0
+        self.level[games] = 1
+        self.lines_to_next_level[games] = LINES_PER_LEVEL
+        self.gravity[games] = gravity_for_level(1)
+        self.game_over[games] = False
+
+        self.piece[games] = self.rng.integers(len(PIECE_NAMES), size=len(games))
+        self._spawn(games, self.piece[games])
+
+    def collides(self, games, piece, rotation, x, y):
+        # Un ET entre les 4 lignes de la boîte de la pièce et le plateau
+        rows = y[:, None] + np.arange(4)
+        board_rows = self.board[games[:, None], rows]
+        masks = MASKS[piece, rotation] << (x + PAD).astype(np.uint32)[:, None]
+        return (board_rows & masks).any(axis=1)
+
+    def step(self, actions):
+        # Appliquer une action par partie ; retourne le nombre de lignes
+        # complétées par chaque partie pendant ce pas
+        actions = np.asarray(actions)
+        cleared = np.zeros(self.count, dtype=np.int64)
+        games = np.flatnonzero(~self.game_over)
+        if len(games) == 0:
+            return cleared
+        actions = actions[games]
+
+        piece = self.piece[games]
+        rotation = self.rotation[games]
+        x = self.x[games]
+        y = self.y[games]
+
+        # Déplacements et rotation : appliqués seulement sans collision
+        new_x = x + (actions == RIGHT) - (actions == LEFT)
+        new_rotation = (rotation + (actions == ROTATE)) % 4
+        new_y = y + (actions == DOWN)
+        blocked = self.collides(games, piece, new_rotation, new_x, new_y)
+        self.x[games] = np.where(blocked, x, new_x)
+        self.rotation[games] = np.where(blocked, rotation, new_rotation)
+        self.y[games] = np.where(blocked, y, new_y)
+
+        # Chute instantanée : descendre tant que la ligne suivante est libre
+        falling = games[actions == HARD_DROP]
+        while len(falling):
+            below = self.y[falling] + 1
+            stop = self.collides(falling, self.piece[falling],
+                                 self.rotation[falling], self.x[falling], below)
+            self.y[falling[~stop]] = below[~stop]
+            falling = falling[~stop]
+
+        # La pièce se fige si la descente est bloquée ou après une chute instantanée
+        locking = games[((actions == DOWN) & blocked) | (actions == HARD_DROP)]
+        if len(locking):
+            cleared[locking] = self._lock(locking)
+
+        # Gravité du tick (y compris pour les pièces qui viennent d'apparaître)
+        games = games[~self.game_over[games]]
+        cleared[games] += self._fall(games)
+        return cleared
+
+    def _fall(self, games):
+        # Comme TetrisEngine.tick / drop : descendre d'autant de lignes entières
+        # qu'accumulé ; une pièce qui reposait déjà au début se fige
+        self.gravity_acc[games] += self.gravity[games]
+        rows = self.gravity_acc[games] >> 16
+        falling = games[rows > 0]
+        rows = rows[rows > 0]
+        self.gravity_acc[falling] &= GRAVITY_ONE - 1
+
+        cleared = np.zeros(self.count, dtype=np.int64)
+        below = self.y[falling] + 1
+        resting = self.collides(falling, self.piece[falling],
+                                self.rotation[falling], self.x[falling], below)
+        if resting.any():
+            locking = falling[resting]
+            cleared[locking] = self._lock(locking)
+        falling = falling[~resting]
+        rows = rows[~resting]
+
+        # Descendre ligne par ligne jusqu'à rows lignes ou jusqu'à l'appui
+        while len(falling):
+            self.y[falling] += 1
+            rows -= 1
+            below = self.y[falling] + 1
+            stop = (rows == 0) | self.collides(falling, self.piece[falling],
+                                               self.rotation[falling], self.x[falling], below)
+            falling = falling[~stop]
+            rows = rows[~stop]
+        return cleared[games]
+
+    def _lock(self, games):
+        rows = self.y[games][:, None] + np.arange(4)
+        masks = MASKS[self.piece[games], self.rotation[games]] \
+            << (self.x[games] + PAD).astype(np.uint32)[:, None]
+        self.board[games[:, None], rows] |= masks
+
+        # Compacter les lignes pleines : elles passent en haut puis sont vidées
+        board = self.board[games, :GRID_HEIGHT]
+        full = board == SOLID_ROW
+        lines_cleared = full.sum(axis=1)
+        order = np.argsort(~full, axis=1, kind="stable")
+        board = np.take_along_axis(board, order, axis=1)
+        board[np.arange(GRID_HEIGHT) < lines_cleared[:, None]] = WALLS
+        self.board[games, :GRID_HEIGHT] = board
+
+        # Score et level, mêmes règles que TetrisEngine
+        self.total_lines_cleared[games] += lines_cleared
+        self.score[games] += LINE_SCORES[np.minimum(lines_cleared, 4)]
+        self.lines_to_next_level[games] -= lines_cleared
+        level_up = games[self.lines_to_next_level[games] <= 0]
+        self.level[level_up] += 1
+        self.lines_to_next_level[level_up] = LINES_PER_LEVEL
+        self.gravity[level_up] = GRAVITIES[
+            np.minimum(self.level[level_up], len(GRAVITIES)) - 1]
+
+        # Passer à la prochaine pièce
+        next_piece = self.next_pieces[games, 0]
+        self.next_pieces[games, :-1] = self.next_pieces[games, 1:]
+        self.next_pieces[games, -1] = self.rng.integers(len(PIECE_NAMES), size=len(games))
+        self._spawn(games, next_piece)
+        return lines_cleared
+
+    def _spawn(self, games, piece):
+        self.piece[games] = piece
+        self.rotation[games] = 0
+        self.x[games] = SPAWN_X
+        self.y[games] = 0
+        self.gravity_acc[games] = 0
+
+        # Vérifier la fin du jeu
+        self.game_over[games] = self.collides(games, piece, self.rotation[games],
+                                              self.x[games], self.y[games])
+
+    def cells(self):
+        # Plateaux sous forme (N, GRID_HEIGHT, GRID_WIDTH) en uint8 (observations)
+        shifts = (PAD + np.arange(GRID_WIDTH)).astype(np.uint32)
+        return ((self.board[:, :GRID_HEIGHT, None] >> shifts) & 1).astype(np.uint8)
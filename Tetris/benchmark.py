@@ -0,0 +1,327 @@
+# Mesures de performance du moteur et de l'affichage, sans fenêtre.
+# Chaque mesure donne un nombre d'opérations par seconde (meilleure de
+# plusieurs répétitions). Les résultats sont ajoutés à un historique JSON et
+# comparés à une exécution de référence : une baisse au-delà de la tolérance
+# fait échouer le benchmark (code de sortie 1).
+#
+#   python benchmark.py                   mesurer, comparer, enregistrer
+#   python benchmark.py --set-baseline    faire de cette exécution la référence
+#   python benchmark.py clear_lines       seulement les mesures dont le nom contient "clear_lines"
+#
+# Avant les mesures, quelques parties sans fenêtre sont rejouées depuis leur
+# journal d'entrées : l'état final doit être identique à l'octet près.
+
+import os
+
+# Affichage et son factices : doit précéder l'import de pygame
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+
+from constants import GRID_WIDTH, GRID_HEIGHT, SHAPES_COLORS
+from simulation import Simulation, TICK_NS
+from tetris_engine import TetrisEngine
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HISTORY_FILE = os.path.join(HERE, "benchmark_history.json")
+
+SEED = 1234
+ACTIONS = ("left", "right", "rotate", "down", "hard_drop")
+
+# Préparation des états de départ
+
+def fill_rows(engine, rows, holes=()):
+    # Remplir les lignes du bas (rows lignes) sauf les colonnes de holes
+    color = SHAPES_COLORS["Z"]
+    for y in range(GRID_HEIGHT - rows, GRID_HEIGHT):
+        for x in range(GRID_WIDTH):
+            if x not in holes:
+                engine.grid[y][x] = color
+                engine.rows[y] |= 1 << x
+    engine.rebuild_board_stats()
+
+def clear_lines_state(count):
+    # count lignes pleines en bas, trois lignes incomplètes au-dessus
+    engine = TetrisEngine(seed=SEED)
+    fill_rows(engine, count + 3)
+    for y in range(GRID_HEIGHT - count - 3, GRID_HEIGHT - count):
+        engine.grid[y][y % GRID_WIDTH] = 0
+        engine.rows[y] &= ~(1 << (y % GRID_WIDTH))
+    engine.rebuild_board_stats()
+    return engine
+
+def random_controller(seed):
+    rng = random.Random(seed)
+
+    def controller(simulation):
+        if rng.random() < 0.2:
+            action = rng.choice(ACTIONS)
+            if rng.random() < 0.6:
+                simulation.press(action)
+            else:
+                simulation.release(action)
+    return controller
+
+def played_engine(pieces=25):
+    # Moteur avec une pile réaliste, obtenue en jouant au hasard
+    engine = TetrisEngine(seed=SEED)
+    simulation = Simulation(engine)
+    controller = random_controller(SEED)
+    locked = 0
+    while locked < pieces and not engine.game_over:
+        piece = engine.piece
+        simulation.run_uncapped(1, controller)
+        if engine.piece is not piece:
+            locked += 1
+    return engine
+
+# Vérification : une partie rejouée depuis son journal d'entrées doit finir
+# dans le même état (sauvegardes identiques)
+
+def timed_game(seed, ticks=3000):
+    # Entrées horodatées comme en jeu, souvent en retard (ramenées au tick courant)
+    rng = random.Random(seed)
+    engine = TetrisEngine(seed=seed)
+    simulation = Simulation(engine)
+    now = 0
+    while simulation.tick_count < ticks and not engine.game_over:
+        now += TICK_NS + rng.randrange(-TICK_NS // 2, TICK_NS // 2)
+        for _ in range(rng.randrange(3)):
+            action = rng.choice(ACTIONS)
+            time_ns = now - rng.randrange(3 * TICK_NS)
+            if rng.random() < 0.6:
+                simulation.press(action, time_ns)
+            else:
+                simulation.release(action, time_ns)
+        simulation.advance(now)
+    return engine, simulation
+
+def check_replays(games=10):
+    # Retourne les parties (type, graine) dont le rejeu diverge
+    failures = []
+    for seed in range(SEED, SEED + games):
+        engine = TetrisEngine(seed=seed)
+        simulation = Simulation(engine)
+        simulation.run_uncapped(3000, random_controller(seed))
+        for kind, (played, played_simulation) in (("sans horodatage", (engine, simulation)),
+                                                 ("horodatées", timed_game(seed))):
+            replayed = TetrisEngine(seed=seed)
+            Simulation(replayed).replay(played_simulation.input_log, played_simulation.tick_count)
+            if replayed.snapshot() != played.snapshot():
+                failures.append((kind, seed))
+    return failures
+
+# Mesures : chaque fonction exécute n opérations et retourne
+# (nombre d'opérations, durée en nanosecondes), préparation exclue
+
+def bench_check_collision(n):
+    engine = played_engine()
+    rng = random.Random(SEED)
+    pieces = []
+    for _ in range(256):
+        name = rng.choice(list(SHAPES_COLORS))
+        pieces.append(engine.make_piece(name, rng.randrange(4),
+                                        (rng.randrange(-1, GRID_WIDTH - 1), rng.randrange(GRID_HEIGHT - 1))))
+    check_collision = engine.check_collision
+    start = time.perf_counter_ns()
+    for i in range(n):
+        check_collision(pieces[i & 255])
+    return n, time.perf_counter_ns() - start
+
+def make_clear_lines_bench(count):
+    def bench(n):
+        engine = clear_lines_state(count)
+        snapshot = engine.snapshot()
+        rows = list(range(GRID_HEIGHT - 4, GRID_HEIGHT))
+        elapsed = 0
+        for _ in range(n):
+            engine.restore(snapshot)
+            start = time.perf_counter_ns()
+            engine.clear_lines(rows)
+            elapsed += time.perf_counter_ns() - start
+        return n, elapsed
+    return bench
+
+def make_lock_bench(clear):
+    # Descente d'une pièce posée : verrouillage, (ligne effacée), pièce suivante
+    def bench(n):
+        engine = TetrisEngine(seed=SEED)
+        if clear:
+            fill_rows(engine, 1, holes=(3, 4, 5, 6))
+        engine.piece = engine.make_piece("I", 0, (3, GRID_HEIGHT - 2))
+        snapshot = engine.snapshot()
+        elapsed = 0
+        for _ in range(n):
+            engine.restore(snapshot)
+            start = time.perf_counter_ns()
+            engine.move_piece(0, 1)
+            elapsed += time.perf_counter_ns() - start
+        return n, elapsed
+    return bench
+
+def bench_rotate_piece(n):
+    engine = played_engine()
+    engine.piece = engine.make_piece("T", 0, (GRID_WIDTH // 2 - 1, 2))
+    rotate_piece = engine.rotate_piece
+    start = time.perf_counter_ns()
+    for _ in range(n):
+        rotate_piece()
+    return n, time.perf_counter_ns() - start
+
+def bench_random_games(n):
+    # n parties complètes aux entrées aléatoires ; opérations = ticks
+    ticks = 0
+    elapsed = 0
+    for game in range(n):
+        engine = TetrisEngine(seed=SEED + game)
+        simulation = Simulation(engine)
+        controller = random_controller(SEED + game)
+        start = time.perf_counter_ns()
+        ticks += simulation.run_uncapped(100000, controller)
+        elapsed += time.perf_counter_ns() - start
+    return ticks, elapsed
+
+def bench_render(n):
+    # Images par seconde de draw_grid + draw_piece + draw_score
+    import pygame
+    from version_finale import Tetris
+
+    game = Tetris()
+    played = played_engine()
+    game.engine.restore(played.snapshot())
+    start = time.perf_counter_ns()
+    for _ in range(n):
+        game.draw_grid()
+        game.draw_piece(game.engine.piece)
+        game.draw_score()
+    elapsed = time.perf_counter_ns() - start
+    pygame.quit()
+    return n, elapsed
+
+BENCHMARKS = [
+    ("check_collision", "ops/s", bench_check_collision),
+    ("clear_lines_0", "ops/s", make_clear_lines_bench(0)),
+    ("clear_lines_1", "ops/s", make_clear_lines_bench(1)),
+    ("clear_lines_2", "ops/s", make_clear_lines_bench(2)),
+    ("clear_lines_3", "ops/s", make_clear_lines_bench(3)),
+    ("clear_lines_4", "ops/s", make_clear_lines_bench(4)),
+    ("move_piece_lock", "ops/s", make_lock_bench(False)),
+    ("move_piece_lock_clear", "ops/s", make_lock_bench(True)),
+    ("rotate_piece", "ops/s", bench_rotate_piece),
+    ("random_games", "ticks/s", bench_random_games),
+    ("render", "frames/s", bench_render),
+]
+
+def measure(bench, min_time, repeat):
+    # Augmenter n jusqu'à ce qu'une exécution dure au moins min_time secondes,
+    # puis garder le meilleur débit sur `repeat` exécutions (ramasse-miettes
+    # arrêté pendant les mesures, comme timeit)
+    gc.collect()
+    gc.disable()
+    try:
+        return best_rate(bench, min_time, repeat)
+    finally:
+        gc.enable()
+
+def best_rate(bench, min_time, repeat):
+    n = 1
+    while True:
+        ops, elapsed = bench(n)
+        if elapsed >= min_time * 1e9:
+            break
+        n *= max(2, min(10, int(min_time * 1e9 / max(elapsed, 1)) + 1))
+    best = ops * 1e9 / elapsed
+    for _ in range(repeat - 1):
+        ops, elapsed = bench(n)
+        best = max(best, ops * 1e9 / elapsed)
+    return best
+
+def git_commit():
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                                capture_output=True, text=True, check=True)
+        return output.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def load_history(path):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (FileNotFoundError, ValueError):
+        return []
+
+def find_baseline(history):
+    for entry in reversed(history):
+        if entry.get("baseline"):
+            return entry
+    return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks du moteur et de l'affichage")
+    parser.add_argument("names", nargs="*", help="mesures à lancer (sous-chaîne du nom)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="durée minimale d'une exécution (s)")
+    parser.add_argument("--repeat", type=int, default=5, help="nombre d'exécutions par mesure")
+    parser.add_argument("--tolerance", type=float, default=0.20,
+                        help="baisse tolérée par rapport à la référence (0.20 = 20 %%)")
+    parser.add_argument("--history", default=HISTORY_FILE, help="fichier d'historique JSON")
+    parser.add_argument("--set-baseline", action="store_true", help="cette exécution devient la référence")
+    parser.add_argument("--no-save", action="store_true", help="ne pas écrire dans l'historique")
+    args = parser.parse_args()
+
+    history = load_history(args.history)
+    baseline = find_baseline(history)
+    reference = baseline["results"] if baseline else {}
+
+    failures = check_replays()
+    if failures:
+        print("Rejeu différent de la partie jouée (entrées, graine) : %s" % failures)
+        sys.exit(1)
+
+    results = {}
+    regressions = []
+    print("%-24s %14s %14s %8s" % ("mesure", "résultat", "référence", "écart"))
+    for name, unit, bench in BENCHMARKS:
+        if args.names and not any(pattern in name for pattern in args.names):
+            continue
+        value = measure(bench, args.min_time, args.repeat)
+        results[name] = value
+
+        line = "%-24s %14s" % (name, "%.0f %s" % (value, unit))
+        if name in reference:
+            change = value / reference[name] - 1
+            line += " %14.0f %+7.1f%%" % (reference[name], change * 100)
+            if change < -args.tolerance:
+                regressions.append(name)
+                line += "  RÉGRESSION"
+        print(line)
+
+    entry = {
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "results": results,
+        # La première exécution enregistrée sert de référence par défaut
+        "baseline": args.set_baseline or baseline is None,
+    }
+    if not args.no_save:
+        history.append(entry)
+        with open(args.history, "w") as file:
+            json.dump(history, file, indent=1)
+
+    if baseline is None and not args.no_save:
+        print("Pas de référence : cette exécution devient la référence.")
+    if regressions:
+        print("Régressions (> %d %%) : %s" % (args.tolerance * 100, ", ".join(regressions)))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+# Comparaison des versions successives du jeu (test2.py à test7.py et
+# version_finale.py), sans fenêtre. Chaque version est chargée, reçoit la
+# même suite de pièces et la même suite d'entrées (une action par image à
+# 60 images par seconde, temps simulé), puis on mesure le temps de logique et
+# d'affichage par image et on compare score et lignes avec version_finale.
+# test.py n'a pas de classe Tetris (le jeu démarre à l'import) : il est ignoré.
+#
+#   python compare_versions.py                   toutes les versions, 30 secondes de jeu
+#   python compare_versions.py --frames 600 --no-render
+#   python compare_versions.py --check           code de sortie 1 si version_finale est plus lente
+
+import os
+
+# Affichage et son factices : doit précéder l'import de pygame
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import importlib.util
+import random
+import sys
+import time
+
+import pygame
+
+from constants import BLACK, SHAPES
+from orientations import PIECE_TYPES
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+VERSIONS = ("test2", "test3", "test4", "test5", "test6", "test7", "version_finale")
+FINAL_VERSION = "version_finale"
+
+FRAME_MS = 1000 / 60
+
+# Probabilité de chaque action par image (le reste : aucune action)
+ACTION_WEIGHTS = (("left", 0.08), ("right", 0.08), ("rotate", 0.08), ("down", 0.30))
+
+def make_inputs(seed, frames):
+    rng = random.Random(seed)
+    inputs = []
+    for _ in range(frames):
+        value = rng.random()
+        action = None
+        for name, weight in ACTION_WEIGHTS:
+            if value < weight:
+                action = name
+                break
+            value -= weight
+        inputs.append(action)
+    return inputs
+
+def load_version(name):
+    spec = importlib.util.spec_from_file_location("version_" + name, os.path.join(HERE, name + ".py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+class SharedRandomizer:
+    # Pièces tirées avec le module random, comme dans les anciennes versions,
+    # pour que version_finale reçoive exactement la même suite de pièces
+    KIND = 0
+
+    def next(self):
+        return PIECE_TYPES[random.choice(list(SHAPES.keys()))]
+
+    def getstate(self):
+        return 0, ()
+
+class OldVersion:
+    # Anciennes versions : la logique est dans la classe Tetris elle-même
+    def __init__(self, game, seed):
+        self.game = game
+        random.seed(seed)
+        if hasattr(game, "reset_game"):
+            game.reset_game()
+        else:
+            game.grid = game.create_empty_grid()
+            game.piece = game.generate_piece()
+            if hasattr(game, "next_pieces"):
+                game.next_pieces = [game.generate_piece() for _ in range(3)]
+            game.score = 0
+            game.game_over = False
+        game.last_drop_time = 0
+
+        # Compter les lignes effacées, même dans les versions sans compteur
+        self.lines = 0
+        clear_lines = game.clear_lines
+
+        def counted_clear_lines():
+            self.lines += sum(all(cell != 0 for cell in row) for row in game.grid)
+            clear_lines()
+        game.clear_lines = counted_clear_lines
+
+    def act(self, action):
+        game = self.game
+        if action == "left":
+            game.move_piece(-1, 0)
+        elif action == "right":
+            game.move_piece(1, 0)
+        elif action == "rotate":
+            game.rotate_piece()
+        elif action == "down":
+            game.move_piece(0, 1)
+
+    def gravity(self, now):
+        # Même règle que la boucle run() de ces versions, sur le temps simulé
+        game = self.game
+        if now - game.last_drop_time > game.drop_speed:
+            game.move_piece(0, 1)
+            game.last_drop_time = now
+
+    def state(self):
+        game = self.game
+        return game.piece, game.score, self.lines, game.game_over
+
+    def draw(self):
+        game = self.game
+        game.screen.fill(BLACK)
+        game.draw_grid()
+        game.draw_piece(game.piece)
+        game.draw_score()
+        if hasattr(game, "draw_preview_pieces"):
+            game.draw_preview_pieces()
+        pygame.display.update()
+
+class FinalVersion:
+    # version_finale : la logique est dans TetrisEngine, un tick par image
+    def __init__(self, game, seed):
+        self.game = game
+        self.engine = game.engine
+        random.seed(seed)
+        self.engine.randomizer = SharedRandomizer()
+        game.reset_game()
+
+    def act(self, action):
+        engine = self.engine
+        if action == "left":
+            engine.move_piece(-1, 0)
+        elif action == "right":
+            engine.move_piece(1, 0)
+        elif action == "rotate":
+            engine.rotate_piece()
+        elif action == "down":
+            engine.move_piece(0, 1)
+
+    def gravity(self, now):
+        self.engine.tick()
+
+    def state(self):
+        engine = self.engine
+        return engine.piece, engine.score, engine.total_lines_cleared, engine.game_over
+
+    def draw(self):
+        # Même suite d'appels que la boucle run() : seules les zones modifiées sont envoyées
+        game = self.game
+        game.draw_grid()
+        game.draw_piece(self.engine.piece)
+        game.draw_score()
+        game.draw_preview_pieces()
+        game.update_display()
+
+def run_version(name, inputs, piece_seed, render):
+    module = load_version(name)
+    game = module.Tetris()
+    version = FinalVersion(game, piece_seed) if name == FINAL_VERSION else OldVersion(game, piece_seed)
+
+    logic_times = []
+    render_times = []
+    pieces = 0
+    for frame, action in enumerate(inputs):
+        piece = version.state()[0]
+        start = time.perf_counter_ns()
+        version.act(action)
+        version.gravity(frame * FRAME_MS)
+        middle = time.perf_counter_ns()
+        if render:
+            version.draw()
+        end = time.perf_counter_ns()
+
+        logic_times.append(middle - start)
+        render_times.append(end - middle)
+        piece_now, score, lines, game_over = version.state()
+        if piece_now is not piece:
+            pieces += 1
+        if game_over:
+            break
+
+    return {
+        "frames": len(logic_times),
+        "logic": logic_times,
+        "render": render_times,
+        "score": score,
+        "lines": lines,
+        "pieces": pieces,
+        "game_over": game_over,
+    }
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, len(values) * p // 100)] if values else 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparaison des versions du jeu")
+    parser.add_argument("versions", nargs="*", default=VERSIONS, help="versions à comparer")
+    parser.add_argument("--frames", type=int, default=1800, help="nombre maximum d'images par partie")
+    parser.add_argument("--seed", type=int, default=2024, help="graine des pièces et des entrées")
+    parser.add_argument("--no-render", action="store_true", help="mesurer seulement la logique")
+    parser.add_argument("--check", action="store_true",
+                        help="échouer si version_finale est plus lente qu'une version précédente")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="écart toléré pour --check (0.10 = 10 %%)")
+    args = parser.parse_args()
+
+    inputs = make_inputs(args.seed, args.frames)
+    results = {}
+    for name in args.versions:
+        results[name] = run_version(name, inputs, args.seed, not args.no_render)
+    pygame.quit()
+
+    final = results.get(FINAL_VERSION)
+    print("%-15s %7s %12s %12s %12s %10s %7s %6s %6s %8s %8s" % (
+        "version", "images", "logique p50", "affich. p50", "affich. p95", "images/s",
+        "score", "lignes", "pièces", "Δ score", "Δ lignes"))
+    for name, result in results.items():
+        logic = result["logic"]
+        draw = result["render"]
+        total = sum(logic) + sum(draw)
+        rate = result["frames"] * 1e9 / total if total else 0
+        result["rate"] = rate
+        score_difference = lines_difference = ""
+        if final is not None and name != FINAL_VERSION:
+            score_difference = "%+d" % (result["score"] - final["score"])
+            lines_difference = "%+d" % (result["lines"] - final["lines"])
+        print("%-15s %7d %9.1f µs %9.2f ms %9.2f ms %10.0f %7d %6d %6d %8s %8s" % (
+            name, result["frames"],
+            percentile(logic, 50) / 1000,
+            percentile(draw, 50) / 1e6,
+            percentile(draw, 95) / 1e6,
+            rate, result["score"], result["lines"], result["pieces"],
+            score_difference, lines_difference))
+    print("Δ : valeur de la version moins celle de %s" % FINAL_VERSION)
+
+    if args.check and final is not None:
+        slower = [name for name, result in results.items()
+                  if name != FINAL_VERSION and final["rate"] < result["rate"] * (1 - args.tolerance)]
+        if slower:
+            print("%s est plus lente que : %s" % (FINAL_VERSION, ", ".join(slower)))
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
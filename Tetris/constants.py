@@ -0,0 +1,43 @@
+# Paramètres de la grille de jeu
+GRID_WIDTH = 10
+GRID_HEIGHT = 20
+CELL_SIZE = 30  # Taille de chaque cellule (en pixels)
+PREVIEW_CELL_SIZE = 20  # Taille des cellules pour la prévisualisation
+
+# Cadence de la logique du jeu (ticks par seconde), indépendante de l'affichage
+TICK_RATE = 60
+
+# Définir les couleurs
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+BLUE = (0, 0, 255)
+CYAN = (0, 255, 255)
+MAGENTA = (255, 0, 255)
+YELLOW = (255, 255, 0)
+ORANGE = (255, 165, 0)
+GRAY = (128, 128, 128)
+DARK_GRAY = (64, 64, 64)
+
+# Les formes des pièces (tetriminos)
+SHAPES = {
+    "I": [(0, 1), (1, 1), (2, 1), (3, 1)],
+    "O": [(0, 0), (1, 0), (0, 1), (1, 1)],
+    "T": [(0, 1), (1, 0), (1, 1), (2, 1)],
+    "L": [(0, 0), (0, 1), (1, 1), (2, 1)],
+    "J": [(2, 0), (0, 1), (1, 1), (2, 1)],
+    "S": [(0, 1), (1, 1), (1, 0), (2, 0)],
+    "Z": [(0, 0), (1, 0), (1, 1), (2, 1)]
+}
+
+# Les couleurs des pièces
+SHAPES_COLORS = {
+    "I": CYAN,
+    "O": YELLOW,
+    "T": MAGENTA,
+    "L": ORANGE,
+    "J": BLUE,
+    "S": GREEN,
+    "Z": RED
+}
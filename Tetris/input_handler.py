@@ -0,0 +1,86 @@
+# Gestion des entrées avec un horodatage en nanosecondes (time.perf_counter_ns).
+# Les déplacements automatiques (DAS : délai avant répétition, ARR : intervalle
+# de répétition) sont calculés à partir des horodatages, pas du nombre
+# d'images : tous les déplacements dus entre deux mises à jour sont rejoués,
+# même si l'ARR est plus court qu'une image. ARR = 0 envoie la pièce au mur.
+
+from tetris_engine import SOFT_DROP_FACTOR  # Multiplicateur de gravité pendant le soft drop
+
+DAS_MS = 200  # Délai avant la répétition d'un déplacement maintenu
+ARR_MS = 50  # Intervalle entre deux déplacements répétés
+
+NS_PER_MS = 1000000
+
+class InputHandler:
+    def __init__(self, das=DAS_MS, arr=ARR_MS, soft_drop_factor=SOFT_DROP_FACTOR):
+        self.das_ns = int(das * NS_PER_MS)
+        self.arr_ns = int(arr * NS_PER_MS)
+        self.soft_drop_factor = soft_drop_factor
+        self.reset()
+
+    def reset(self):
+        self.held = {"left": False, "right": False}
+        self.direction = 0  # -1 gauche, 1 droite, 0 aucun
+        self.press_time = 0
+        self.shifts = 0  # Déplacements déjà faits depuis press_time
+
+    def press(self, engine, action, time_ns):
+        if action in self.held:
+            # Terminer les déplacements dus dans l'ancienne direction
+            self.update(engine, time_ns)
+            self.held[action] = True
+            self.direction = -1 if action == "left" else 1
+            self.press_time = time_ns
+            # Un appui déplace tout de suite d'une case
+            engine.move_piece(self.direction, 0)
+            self.shifts = 1
+        elif action == "down":
+            engine.soft_drop_factor = self.soft_drop_factor
+            engine.soft_drop = True
+        elif action == "rotate":
+            engine.rotate_piece()
+        elif action == "hard_drop":
+            engine.hard_drop()
+
+    def release(self, engine, action, time_ns):
+        if action in self.held:
+            self.update(engine, time_ns)
+            self.held[action] = False
+            if self.direction == (-1 if action == "left" else 1):
+                # Revenir à l'autre direction si elle est toujours maintenue,
+                # avec un nouveau délai avant répétition
+                other = "right" if action == "left" else "left"
+                self.direction = (1 if other == "right" else -1) if self.held[other] else 0
+                self.press_time = time_ns
+                self.shifts = 1
+        elif action == "down":
+            engine.soft_drop = False
+            engine.soft_drop_score = 0
+
+    def update(self, engine, time_ns):
+        # Appliquer tous les déplacements automatiques dus jusqu'à time_ns
+        if self.direction == 0:
+            return
+        held_for = time_ns - self.press_time
+        if held_for < self.das_ns:
+            return
+
+        if self.arr_ns == 0:
+            # ARR nul : jusqu'au mur en une fois
+            self.shift(engine, None)
+            return
+
+        due = 2 + (held_for - self.das_ns) // self.arr_ns
+        if due > self.shifts:
+            self.shift(engine, due - self.shifts)
+            self.shifts = due
+
+    def shift(self, engine, count):
+        # count déplacements (ou jusqu'au blocage si count vaut None)
+        done = 0
+        while count is None or done < count:
+            position = engine.piece["position"]
+            engine.move_piece(self.direction, 0)
+            if engine.piece["position"] == position:
+                break
+            done += 1
@@ -0,0 +1,63 @@
+from collections import namedtuple
+
+from constants import SHAPES, SHAPES_COLORS
+
+# Une orientation d'une pièce, calculée une seule fois à l'import :
+# - cells : cases occupées (x, y) dans la boîte de la pièce
+# - min_x, max_x, min_y, max_y : boîte englobante des cases
+# - bottom : pour chaque colonne de min_x à max_x, le y le plus bas occupé
+# - row_masks : (dy, masque) par ligne, bit 0 = colonne min_x
+Orientation = namedtuple(
+    "Orientation",
+    ["cells", "min_x", "max_x", "min_y", "max_y", "bottom", "row_masks"]
+)
+
+def build_orientation(cells):
+    min_x = min(x for x, _ in cells)
+    max_x = max(x for x, _ in cells)
+    min_y = min(y for _, y in cells)
+    max_y = max(y for _, y in cells)
+
+    bottom = tuple(
+        max(y for x, y in cells if x == column)
+        for column in range(min_x, max_x + 1)
+    )
+
+    rows = {}
+    for x, y in cells:
+        rows[y] = rows.get(y, 0) | (1 << (x - min_x))
+
+    return Orientation(tuple(cells), min_x, max_x, min_y, max_y, bottom,
+                       tuple(sorted(rows.items())))
+
+def build_orientations(shape):
+    # Rotation autour du centre de la boîte de la pièce (4x4 pour I,
+    # 2x2 pour O, 3x3 pour les autres) pour que la pièce ne dérive pas
+    size = max(max(x, y) for x, y in shape) + 1
+    cells = sorted(shape, key=lambda cell: (cell[1], cell[0]))
+    orientations = []
+    for _ in range(4):
+        orientations.append(build_orientation(cells))
+        # Même sens que l'ancienne rotation (x, y) -> (y, -x)
+        cells = sorted(((y, size - 1 - x) for x, y in cells),
+                       key=lambda cell: (cell[1], cell[0]))
+    return tuple(orientations)
+
+# Les 4 orientations de chaque pièce, partagées par le moteur, l'affichage et les IA
+ORIENTATIONS = {name: build_orientations(shape) for name, shape in SHAPES.items()}
+
+# Les boîtes font au plus 4 cases de large : leur x va de -X_OFFSET à
+# GRID_WIDTH - 1 (index x + X_OFFSET des tables par position)
+X_OFFSET = 3
+
+# Ordre fixe des pièces (index utilisés par les sauvegardes et les hash)
+PIECE_NAMES = tuple(SHAPES)
+
+# Description immuable d'un type de pièce, partagée par toutes les pièces de
+# ce type (file des prochaines pièces, générateurs aléatoires)
+PieceType = namedtuple("PieceType", ["name", "index", "color", "orientations"])
+
+PIECE_TYPES = {
+    name: PieceType(name, index, SHAPES_COLORS[name], ORIENTATIONS[name])
+    for index, name in enumerate(PIECE_NAMES)
+}
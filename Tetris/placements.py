@@ -0,0 +1,120 @@
+from collections import namedtuple
+
+from constants import GRID_WIDTH, GRID_HEIGHT
+from orientations import ORIENTATIONS, X_OFFSET
+
+# Une position finale atteignable : position de la boîte, orientation, et
+# suite de mouvements qui y mène depuis la position de départ de la pièce.
+# Une fois la pièce à cette position, un dernier "down" la fige.
+Placement = namedtuple("Placement", ["x", "y", "rotation", "path"])
+
+# Les x de la boîte vont de -X_OFFSET à GRID_WIDTH - 1
+X_RANGE = GRID_WIDTH + X_OFFSET
+
+def build_shifted_masks(orientations):
+    # SHIFTED[rotation][x + X_OFFSET] = [(dy, masque décalé)], ou None si la
+    # pièce sort de la grille à gauche ou à droite pour ce x
+    table = []
+    for orientation in orientations:
+        by_x = []
+        for x in range(-X_OFFSET, GRID_WIDTH):
+            left = x + orientation.min_x
+            if left < 0 or x + orientation.max_x >= GRID_WIDTH:
+                by_x.append(None)
+            else:
+                by_x.append(tuple((dy, mask << left) for dy, mask in orientation.row_masks))
+        table.append(by_x)
+    return table
+
+SHIFTED_MASKS = {name: build_shifted_masks(orientations)
+                 for name, orientations in ORIENTATIONS.items()}
+
+# Plus grand y occupé par une pièce, toutes orientations confondues
+MAX_Y = {name: max(orientation.max_y for orientation in orientations)
+         for name, orientations in ORIENTATIONS.items()}
+
+def fits(rows, masks, y):
+    # Même test que TetrisEngine.check_collision, sur un bitboard
+    if masks is None:
+        return False
+    for dy, mask in masks:
+        row = y + dy
+        if row >= GRID_HEIGHT:
+            return False
+        if row >= 0 and rows[row] & mask:
+            return False
+    return True
+
+def enumerate_placements(rows, piece):
+    # Parcours en largeur des états (x, y, rotation) atteignables depuis la
+    # position actuelle de la pièce, avec les mêmes mouvements que
+    # move_piece / rotate_piece ; rows est le bitboard (engine.rows).
+    # Les glissements sous un surplomb et les rotations en place sont inclus.
+    table = SHIFTED_MASKS[piece["name"]]
+    start_x, start_y = piece["position"]
+    if not 0 <= start_x + X_OFFSET < X_RANGE or \
+            not fits(rows, table[piece["rotation"]][start_x + X_OFFSET], start_y):
+        return []
+
+    # Au-dessus de la pile, seules les bordures comptent : toutes les
+    # positions y sont équivalentes. On commence donc directement à la plus
+    # basse ligne où aucune orientation ne touche la pile, au lieu de
+    # parcourir chaque ligne vide.
+    top = next((i for i, row in enumerate(rows) if row), GRID_HEIGHT)
+    open_y = top - 1 - MAX_Y[piece["name"]]
+    skipped_downs = max(0, open_y - start_y)
+    start = (start_x, start_y + skipped_downs, piece["rotation"])
+
+    # parents[état] = (état précédent, mouvement), seulement pour les états libres
+    parents = {start: None}
+    blocked = set()
+    resting = {}
+    queue = [start]
+
+    for state in queue:
+        x, y, rotation = state
+        column = x + X_OFFSET
+
+        # Descendre ; si c'est impossible, la position est finale. Deux
+        # orientations qui occupent les mêmes cases (O, I, S, Z) ne
+        # comptent qu'une fois, avec le chemin le plus court.
+        below = (x, y + 1, rotation)
+        if below not in parents:
+            if fits(rows, table[rotation][column], y + 1):
+                parents[below] = (state, "down")
+                queue.append(below)
+            else:
+                cells = tuple((y + dy, mask) for dy, mask in table[rotation][column])
+                if cells not in resting:
+                    resting[cells] = state
+
+        # Gauche, droite et rotation
+        for next_state, move in (((x - 1, y, rotation), "left"),
+                                 ((x + 1, y, rotation), "right"),
+                                 ((x, y, (rotation + 1) % 4), "rotate")):
+            if next_state in parents or next_state in blocked:
+                continue
+            next_column = next_state[0] + X_OFFSET
+            if 0 <= next_column < X_RANGE and \
+                    fits(rows, table[next_state[2]][next_column], y):
+                parents[next_state] = (state, move)
+                queue.append(next_state)
+            else:
+                blocked.add(next_state)
+
+    placements = []
+    for state in resting.values():
+        path = []
+        step = parents[state]
+        while step is not None:
+            previous, move = step
+            path.append(move)
+            step = parents[previous]
+        path.reverse()
+
+        # Les mouvements faits au-dessus de la pile ont lieu avant la chute
+        if skipped_downs:
+            first_down = path.index("down") if "down" in path else len(path)
+            path[first_down:first_down] = ["down"] * skipped_downs
+        placements.append(Placement(state[0], state[1], state[2], path))
+    return placements
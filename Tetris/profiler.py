@@ -0,0 +1,114 @@
+# Mesure du temps passé dans chaque phase d'une image (horloge haute
+# résolution time.perf_counter_ns). Les durées des dernières images sont
+# gardées dans un tableau circulaire de taille fixe : pas d'allocation
+# pendant la partie, et les percentiles portent sur une fenêtre glissante.
+
+import csv
+import json
+import time
+
+from constants import TICK_RATE
+from tracer import NULL_TRACER
+
+# Phases d'une image de jeu, dans l'ordre
+FRAME_PHASES = (
+    "handle_events",
+    "update",
+    "draw_grid",
+    "draw_piece",
+    "draw_score",
+    "draw_preview_pieces",
+    "overlay",
+    "display_update",
+)
+
+PERCENTILES = (50, 95, 99)
+NS_PER_MS = 1000000
+
+def percentile(sorted_values, p):
+    # Percentile par rang le plus proche sur une liste déjà triée
+    if not sorted_values:
+        return 0
+    rank = (len(sorted_values) * p + 99) // 100
+    return sorted_values[max(rank, 1) - 1]
+
+class FrameProfiler:
+    def __init__(self, phases=FRAME_PHASES, capacity=600, budget_ms=1000 / TICK_RATE):
+        self.phases = phases
+        self.index = {name: i for i, name in enumerate(phases)}
+        self.capacity = capacity
+        self.budget_ms = budget_ms
+        # Traceur optionnel : chaque phase devient aussi un intervalle de la trace
+        self.tracer = NULL_TRACER
+        self.reset()
+
+    def reset(self):
+        # Une ligne par phase, plus une pour la durée totale de l'image (en ns)
+        self.samples = [[0] * self.capacity for _ in range(len(self.phases) + 1)]
+        self.position = 0
+        self.count = 0
+        self.last = 0
+        self.frame_start = 0
+
+    def start_frame(self):
+        self.last = self.frame_start = time.perf_counter_ns()
+        for row in self.samples:
+            row[self.position] = 0
+
+    def mark(self, phase):
+        # Fin de la phase `phase` : temps écoulé depuis la marque précédente
+        now = time.perf_counter_ns()
+        self.samples[self.index[phase]][self.position] += now - self.last
+        self.tracer.complete(phase, self.last, now)
+        self.last = now
+
+    def end_frame(self):
+        position = self.position
+        self.samples[-1][position] = sum(row[position] for row in self.samples[:-1])
+        self.tracer.complete("frame", self.frame_start, self.last)
+        self.position = (position + 1) % self.capacity
+        self.count += 1
+
+    def frames(self):
+        # Index des images enregistrées, de la plus ancienne à la plus récente
+        size = min(self.count, self.capacity)
+        start = (self.position - size) % self.capacity
+        return [(start + i) % self.capacity for i in range(size)]
+
+    def stats(self):
+        # {phase: (p50, p95, p99)} en millisecondes, plus "frame" pour l'image entière
+        order = self.frames()
+        result = {}
+        for name, row in zip(self.phases + ("frame",), self.samples):
+            values = sorted(row[i] for i in order)
+            result[name] = tuple(percentile(values, p) / NS_PER_MS for p in PERCENTILES)
+        return result
+
+    def budget_left(self, stats=None):
+        # Marge restante (ms) par rapport au budget d'une image, au 95e percentile
+        if stats is None:
+            stats = self.stats()
+        return self.budget_ms - stats["frame"][1]
+
+    def dump(self, path):
+        # Export des durées par image (ms) : JSON si le fichier finit par .json, CSV sinon
+        order = self.frames()
+        columns = self.phases + ("frame",)
+        rows = [[row[i] / NS_PER_MS for row in self.samples] for i in order]
+        if path.endswith(".json"):
+            stats = self.stats()
+            data = {
+                "budget_ms": self.budget_ms,
+                "phases": list(columns),
+                "percentiles": {name: dict(zip(("p50", "p95", "p99"), values))
+                                for name, values in stats.items()},
+                "frames": rows,
+            }
+            with open(path, "w") as file:
+                json.dump(data, file, indent=1)
+        else:
+            with open(path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(("index",) + columns)
+                for n, row in enumerate(rows):
+                    writer.writerow([n] + ["%.4f" % value for value in row])
@@ -0,0 +1,150 @@
+import random
+
+from orientations import PIECE_NAMES, PIECE_TYPES
+
+MASK64 = (1 << 64) - 1
+
+def splitmix64(value):
+    # Mélange une graine pour que des graines proches (1, 2, 3...) donnent
+    # des suites indépendantes
+    value = (value + 0x9E3779B97F4A7C15) & MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+# Petit générateur pseudo-aléatoire (xorshift64*) dont tout l'état tient
+# sur 64 bits, pour que les sauvegardes de partie restent compactes
+class Xorshift64:
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.state = splitmix64(seed) or 1
+
+    def next(self):
+        x = self.state
+        x ^= x >> 12
+        x ^= (x << 25) & MASK64
+        x ^= x >> 27
+        self.state = x
+        return (x * 0x2545F4914F6CDD1D) & MASK64
+
+    def randrange(self, n):
+        # Les 32 bits de poids fort ramenés dans [0, n)
+        return ((self.next() >> 32) * n) >> 32
+
+    def choice(self, sequence):
+        return sequence[self.randrange(len(sequence))]
+
+    def getstate(self):
+        return self.state
+
+    def setstate(self, state):
+        self.state = state
+
+# Générateurs de pièces : chacun a sa propre graine et retourne des
+# descriptions immuables (PieceType). getstate() / setstate() permettent de
+# sauvegarder leur état : (état du générateur, index des pièces en mémoire).
+
+class UniformRandomizer:
+    # Tirage uniforme indépendant à chaque pièce (comportement d'origine)
+    KIND = 0
+
+    def __init__(self, seed=None):
+        self.rng = Xorshift64(seed)
+
+    def next(self):
+        return PIECE_TYPES[self.rng.choice(PIECE_NAMES)]
+
+    def getstate(self):
+        return self.rng.getstate(), ()
+
+    def setstate(self, state):
+        self.rng.setstate(state[0])
+
+class BagRandomizer:
+    # Sac de 7 : chaque série de 7 pièces contient une pièce de chaque type
+    KIND = 1
+
+    def __init__(self, seed=None):
+        self.rng = Xorshift64(seed)
+        self.bag = []
+
+    def next(self):
+        if not self.bag:
+            self.bag = list(PIECE_NAMES)
+            # Mélange de Fisher-Yates avec le générateur de la partie
+            for i in range(len(self.bag) - 1, 0, -1):
+                j = self.rng.randrange(i + 1)
+                self.bag[i], self.bag[j] = self.bag[j], self.bag[i]
+        return PIECE_TYPES[self.bag.pop()]
+
+    def getstate(self):
+        return self.rng.getstate(), tuple(PIECE_TYPES[name].index for name in self.bag)
+
+    def setstate(self, state):
+        self.rng.setstate(state[0])
+        self.bag = [PIECE_NAMES[index] for index in state[1]]
+
+class HistoryRandomizer:
+    # Tirage avec historique : on retire jusqu'à `tries` fois une pièce
+    # présente parmi les 4 dernières, ce qui évite les longues répétitions
+    KIND = 2
+    HISTORY_LENGTH = 4
+
+    def __init__(self, seed=None, tries=4):
+        self.rng = Xorshift64(seed)
+        self.tries = tries
+        self.history = ["Z", "Z", "S", "S"]
+
+    def next(self):
+        for _ in range(self.tries):
+            name = self.rng.choice(PIECE_NAMES)
+            if name not in self.history:
+                break
+        self.history.pop(0)
+        self.history.append(name)
+        return PIECE_TYPES[name]
+
+    def getstate(self):
+        return self.rng.getstate(), tuple(PIECE_TYPES[name].index for name in self.history)
+
+    def setstate(self, state):
+        self.rng.setstate(state[0])
+        self.history = [PIECE_NAMES[index] for index in state[1]]
+
+RANDOMIZERS = {
+    UniformRandomizer.KIND: UniformRandomizer,
+    BagRandomizer.KIND: BagRandomizer,
+    HistoryRandomizer.KIND: HistoryRandomizer,
+}
+
+# File des prochaines pièces dans un tableau circulaire de taille fixe :
+# retirer la première pièce et en ajouter une nouvelle se fait en O(1)
+class PreviewQueue:
+    def __init__(self, randomizer, length=3):
+        self.randomizer = randomizer
+        self.items = [randomizer.next() for _ in range(length)]
+        self.start = 0
+
+    def pop(self):
+        piece = self.items[self.start]
+        self.items[self.start] = self.randomizer.next()
+        self.start = (self.start + 1) % len(self.items)
+        return piece
+
+    def fill(self, pieces):
+        # Remplacer le contenu de la file (restauration d'une sauvegarde)
+        self.items = list(pieces)
+        self.start = 0
+
+    def __getitem__(self, i):
+        if not 0 <= i < len(self.items):
+            raise IndexError(i)
+        return self.items[(self.start + i) % len(self.items)]
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        for i in range(len(self.items)):
+            yield self.items[(self.start + i) % len(self.items)]
@@ -0,0 +1,126 @@
+# Boucle de simulation à pas fixe, indépendante de l'affichage.
+# La logique avance par ticks de durée fixe (TICK_RATE par seconde) : en jeu,
+# le temps réel (time.perf_counter_ns) est converti en nombre de ticks ; sans
+# fenêtre, run_uncapped() enchaîne les ticks aussi vite que possible.
+# Les entrées sont horodatées en nanosecondes de temps de simulation et
+# enregistrées avec cet horodatage, ce qui rend une partie rejouable à
+# l'identique, répétitions automatiques (DAS/ARR) comprises.
+
+from constants import TICK_RATE
+from input_handler import InputHandler
+
+TICK_NS = 1000000000 // TICK_RATE
+
+# Nombre maximum de ticks rattrapés en une image (évite la spirale quand
+# l'affichage prend du retard)
+MAX_CATCH_UP_TICKS = 10
+
+class Simulation:
+    def __init__(self, engine, input_handler=None):
+        self.engine = engine
+        self.input = input_handler if input_handler is not None else InputHandler()
+        self.reset()
+
+    def reset(self, now_ns=0):
+        # now_ns : instant réel qui correspond au début de la partie
+        self.tick_count = 0
+        self.origin_ns = now_ns
+        self.paused_at = None
+        self.input.reset()
+
+        # Entrées en attente (temps de simulation, type, action), et journal
+        self.pending = []
+        self.input_log = []
+
+    def pause(self, now_ns):
+        # Geler le temps de simulation à l'instant réel now_ns. Les touches
+        # maintenues sont relâchées : leur relâchement peut être manqué
+        # pendant la pause (fenêtre en arrière-plan)
+        for action, held in self.input.held.items():
+            if held:
+                self.release(action, now_ns)
+        if self.engine.soft_drop:
+            self.release("down", now_ns)
+        self.paused_at = now_ns
+
+    def resume(self, now_ns):
+        # Décaler l'origine de la durée de la pause : pas de ticks de rattrapage
+        if self.paused_at is not None:
+            self.origin_ns += now_ns - self.paused_at
+            self.paused_at = None
+
+    def time_ns(self):
+        # Temps de simulation au début du tick courant
+        return self.tick_count * TICK_NS
+
+    def press(self, action, now_ns=None):
+        self.queue_input("press", action, now_ns)
+
+    def release(self, action, now_ns=None):
+        self.queue_input("release", action, now_ns)
+
+    def queue_input(self, kind, action, now_ns):
+        # Sans horodatage (bots, mode sans fenêtre), l'entrée est appliquée au tick courant
+        if now_ns is None:
+            time_ns = self.time_ns()
+        else:
+            time_ns = max(now_ns - self.origin_ns, self.time_ns())
+        self.pending.append((time_ns, kind, action))
+
+    def apply_input(self, time_ns, kind, action):
+        self.input_log.append((time_ns, kind, action))
+        if kind == "press":
+            self.input.press(self.engine, action, time_ns)
+        else:
+            self.input.release(self.engine, action, time_ns)
+
+    def step(self):
+        # Un tick de logique : entrées du tick (dans l'ordre de leurs
+        # horodatages), déplacements automatiques dus, gravité. Le tick couvre
+        # [début, fin[ : une entrée placée au début du tick courant par
+        # queue_input est rejouée dans ce même tick, pas dans le précédent
+        end_ns = (self.tick_count + 1) * TICK_NS
+        if self.pending:
+            self.pending.sort(key=lambda entry: entry[0])
+            count = 0
+            for entry in self.pending:
+                if entry[0] >= end_ns:
+                    break
+                self.input.update(self.engine, entry[0])
+                self.apply_input(*entry)
+                count += 1
+            del self.pending[:count]
+
+        self.input.update(self.engine, end_ns)
+        self.engine.tick()
+        self.tick_count += 1
+
+    def advance(self, now_ns):
+        # Exécuter les ticks terminés à l'instant réel now_ns ;
+        # retourne le nombre de ticks exécutés
+        ticks = 0
+        while (self.tick_count + 1) * TICK_NS <= now_ns - self.origin_ns and not self.engine.game_over:
+            if ticks == MAX_CATCH_UP_TICKS:
+                # Trop de retard : abandonner le temps restant
+                self.origin_ns = now_ns - self.tick_count * TICK_NS
+                break
+            self.step()
+            ticks += 1
+        return ticks
+
+    def run_uncapped(self, max_ticks=None, controller=None):
+        # Mode sans fenêtre : enchaîner les ticks sans attendre le temps réel.
+        # controller(simulation) est appelé avant chaque tick pour donner les entrées.
+        start = self.tick_count
+        while not self.engine.game_over:
+            if max_ticks is not None and self.tick_count - start >= max_ticks:
+                break
+            if controller is not None:
+                controller(self)
+            self.step()
+        return self.tick_count - start
+
+    def replay(self, input_log, max_ticks=None):
+        # Rejouer un journal d'entrées (sur un moteur remis dans l'état de départ)
+        self.pending = list(input_log)
+        return self.run_uncapped(max_ticks)
@@ -0,0 +1,470 @@
+import struct
+from collections import namedtuple
+
+from constants import GRID_WIDTH, GRID_HEIGHT, SHAPES_COLORS, TICK_RATE
+from orientations import ORIENTATIONS, PIECE_NAMES, PIECE_TYPES
+from randomizer import RANDOMIZERS, UniformRandomizer, PreviewQueue
+from tracer import NULL_TRACER
+from zobrist import CELL_KEYS, ROW_HASHES, board_hash, piece_hash, queue_hash
+
+# Points gagnés selon le nombre de lignes complétées en une fois
+SCORE_MULTIPLIERS = {0: 0, 1: 100, 2: 300, 3: 500, 4: 800}
+
+# Règles de passage de level et de vitesse de descente (en millisecondes)
+LINES_PER_LEVEL = 10
+BASE_DROP_SPEED = 500
+MIN_DROP_SPEED = 50
+
+def drop_speed_for_level(level, base_drop_speed=BASE_DROP_SPEED):
+    # Diminuer le drop_speed de 10% à chaque level
+    return max(MIN_DROP_SPEED, int(base_drop_speed * (0.9 ** (level - 1))))
+
+# Gravité en 1/65536 de ligne par tick : GRAVITY_ONE = 1 ligne par tick (1G),
+# GRAVITY_20G = toute la hauteur de la grille en un tick (chute instantanée)
+GRAVITY_ONE = 1 << 16
+GRAVITY_20G = GRID_HEIGHT * GRAVITY_ONE
+
+def gravity_from_ms(drop_speed, tick_rate=TICK_RATE):
+    # Une ligne toutes les drop_speed millisecondes -> lignes par tick
+    return GRAVITY_ONE * 1000 // (drop_speed * tick_rate)
+
+# Gravité par level : jusqu'au level 15, les mêmes vitesses qu'avant
+# (drop_speed_for_level) ; ensuite elle continue d'augmenter au-delà d'une
+# ligne par tick, jusqu'à 20G
+GRAVITY_TABLE = [gravity_from_ms(drop_speed_for_level(level)) for level in range(1, 16)] + [
+    GRAVITY_ONE // 4, GRAVITY_ONE // 2, GRAVITY_ONE, 2 * GRAVITY_ONE,
+    3 * GRAVITY_ONE, 5 * GRAVITY_ONE, 10 * GRAVITY_ONE, GRAVITY_20G,
+]
+
+def gravity_for_level(level):
+    return GRAVITY_TABLE[min(level, len(GRAVITY_TABLE)) - 1]
+
+# Le soft drop multiplie la gravité (50 ms par ligne au level 1, comme avant)
+SOFT_DROP_FACTOR = 10
+
+# Résultat d'une suppression de lignes, pour l'affichage et les statistiques
+# sans avoir à relire la grille
+ClearResult = namedtuple("ClearResult", ["rows", "clear_type", "score_delta", "level_change"])
+
+CLEAR_TYPES = {0: None, 1: "single", 2: "double", 3: "triple", 4: "tetris"}
+
+def compact_rows(rows, cleared, empty_row):
+    # Supprimer en une seule passe les lignes d'indices cleared (triés) :
+    # les lignes au-dessus descendent, et les lignes supprimées sont
+    # réutilisées en haut après être passées par empty_row
+    recycled = [rows[i] for i in cleared]
+    write = cleared[-1]
+    for read in range(cleared[-1] - 1, -1, -1):
+        if read in cleared:
+            continue
+        rows[write] = rows[read]
+        write -= 1
+    for i, row in enumerate(recycled):
+        rows[i] = empty_row(row)
+
+def empty_mask(row):
+    # Ligne de bitboard ou compteur : la ligne vide est 0
+    return 0
+
+def empty_cells(row):
+    # Ligne de couleurs : vidée sur place, sans nouvelle liste
+    for x in range(GRID_WIDTH):
+        row[x] = 0
+    return row
+
+# Sauvegarde binaire de l'état complet, à taille fixe :
+# version, drapeaux, pièce active (type, rotation, x, y), file des prochaines
+# pièces (longueur puis index), score, lignes, level, points de soft drop,
+# gravité accumulée (toujours moins d'une ligne), générateur de pièces (type,
+# état, pièces en mémoire) et couleurs de la grille, 3 bits par case collés
+# les uns aux autres (0 = vide, sinon index de la pièce + 1). Le bitboard
+# n'est pas sauvegardé : il se déduit des cases non vides.
+SNAPSHOT_VERSION = 5
+SNAPSHOT_PREVIEW_SLOTS = 8
+SNAPSHOT_RANDOMIZER_SLOTS = 8
+SNAPSHOT_GRID_BYTES = (3 * GRID_WIDTH * GRID_HEIGHT + 7) // 8
+SNAPSHOT_FORMAT = struct.Struct(
+    "<BBBBbbB%dsIIHhHHBQ%ds%ds" % (SNAPSHOT_PREVIEW_SLOTS, SNAPSHOT_RANDOMIZER_SLOTS,
+                                    SNAPSHOT_GRID_BYTES)
+)
+NO_PIECE = 0xFF
+COLOR_CODES = {SHAPES_COLORS[name]: i + 1 for i, name in enumerate(PIECE_NAMES)}
+CODE_COLORS = [0] + [SHAPES_COLORS[name] for name in PIECE_NAMES]
+
+# Moteur de jeu sans pygame : grille, pièce active, file des prochaines
+# pièces et score. Peut tourner sans fenêtre (bots, tests, serveurs).
+class TetrisEngine:
+    def __init__(self, seed=None, randomizer=None, preview_length=3):
+        # Générateur de pièces propre au moteur (graine explicite possible) :
+        # uniforme par défaut, ou BagRandomizer / HistoryRandomizer
+        self.randomizer = randomizer if randomizer is not None else UniformRandomizer(seed)
+        if not 1 <= preview_length <= SNAPSHOT_PREVIEW_SLOTS:
+            raise ValueError("La file doit contenir de 1 à %d pièces" % SNAPSHOT_PREVIEW_SLOTS)
+        self.preview_length = preview_length
+        self.soft_drop_factor = SOFT_DROP_FACTOR
+        # Traceur optionnel (tracer.Tracer) : verrouillage, lignes, level
+        self.tracer = NULL_TRACER
+        # Compteur incrémenté à chaque changement de la grille (pose, lignes,
+        # nouvelle partie, restauration) : l'affichage s'en sert pour savoir
+        # quand redessiner la pile
+        self.board_version = 0
+        self.reset()
+
+    def reset(self):
+        # Bitboard : chaque ligne est un entier (utilisé pour les collisions)
+        self.rows = [0] * GRID_HEIGHT
+        # Couleurs des cellules, utilisées seulement pour l'affichage
+        self.grid = self.create_empty_grid()
+
+        # Statistiques du plateau tenues à jour à chaque pose et suppression :
+        # hauteur de chaque colonne, cases remplies par ligne, nombre de trous
+        self.heights = [0] * GRID_WIDTH
+        self.row_fill = [0] * GRID_HEIGHT
+        self.holes = 0
+        self.last_clear = None
+
+        # Hash de Zobrist de la grille, mis à jour à chaque pose et suppression
+        self.board_hash = 0
+        self.board_version += 1
+
+        self.piece = self.generate_piece()
+        self.next_pieces = PreviewQueue(self.randomizer, self.preview_length)
+        self.score = 0
+        self.game_over = False
+
+        self.soft_drop = False
+        self.soft_drop_score = 0
+
+        self.total_lines_cleared = 0
+        self.level = 1
+        self.lines_to_next_level = LINES_PER_LEVEL
+
+        # Gravité du level (en 1/65536 de ligne par tick) et fraction de
+        # ligne accumulée depuis la dernière descente
+        self.gravity = gravity_for_level(self.level)
+        self.gravity_acc = 0
+
+    def create_empty_grid(self):
+        return [[0 for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
+
+    def generate_piece(self):
+        return self.make_piece(self.randomizer.next().name)
+
+    def make_piece(self, shape_name, rotation=0, position=(GRID_WIDTH // 2 - 1, 0)):
+        shape = ORIENTATIONS[shape_name][rotation].cells
+        color = SHAPES_COLORS[shape_name]
+        return {"name": shape_name, "rotation": rotation, "shape": shape,
+                "position": position, "color": color}
+
+    def check_collision(self, piece):
+        orientation = ORIENTATIONS[piece["name"]][piece["rotation"]]
+        piece_x, piece_y = piece["position"]
+
+        # Sortie de la grille à gauche ou à droite
+        left = piece_x + orientation.min_x
+        if left < 0 or piece_x + orientation.max_x >= GRID_WIDTH:
+            return True
+
+        # Un ET par ligne occupée par la pièce
+        rows = self.rows
+        for dy, mask in orientation.row_masks:
+            new_y = piece_y + dy
+            if new_y >= GRID_HEIGHT:
+                return True
+            if new_y >= 0 and rows[new_y] & (mask << left):
+                return True
+        return False
+
+    def clear_lines(self, candidate_rows=None):
+        # Trouver les lignes complètes avec les compteurs de remplissage
+        # (seulement parmi candidate_rows si les lignes touchées sont connues)
+        if candidate_rows is None:
+            candidate_rows = range(GRID_HEIGHT)
+        lines_to_clear = [i for i in candidate_rows if self.row_fill[i] == GRID_WIDTH]
+
+        # Calculer le nombre de lignes complétées
+        lines_cleared = len(lines_to_clear)
+
+        # Supprimer les lignes complètes en une passe sur chaque structure
+        if lines_cleared:
+            # Les lignes au-dessus de la plus basse supprimée changent de
+            # place : retirer leur hash avant, le remettre après
+            for y in range(lines_to_clear[-1] + 1):
+                self.board_hash ^= ROW_HASHES[y][self.rows[y]]
+            compact_rows(self.rows, lines_to_clear, empty_mask)
+            for y in range(lines_to_clear[-1] + 1):
+                self.board_hash ^= ROW_HASHES[y][self.rows[y]]
+            compact_rows(self.grid, lines_to_clear, empty_cells)
+            compact_rows(self.row_fill, lines_to_clear, empty_mask)
+            self.update_heights_after_clear(lines_cleared)
+            self.board_version += 1
+
+        # Mettre à jour le nombre total de lignes complétées
+        self.total_lines_cleared += lines_cleared
+
+        # Calculer le score
+        score_delta = SCORE_MULTIPLIERS.get(lines_cleared, 1200)
+        self.score += score_delta
+
+        # Gérer le passage de level
+        self.lines_to_next_level -= lines_cleared
+
+        # Augmenter le level si nécessaire
+        level = self.level
+        if self.lines_to_next_level <= 0:
+            self.level_up()
+
+        self.last_clear = ClearResult(tuple(lines_to_clear), CLEAR_TYPES.get(lines_cleared),
+                                      score_delta, self.level - level)
+        return self.last_clear
+
+    def level_up(self):
+        # Augmenter le level
+        self.level += 1
+
+        # Réinitialiser les lignes pour le prochain level
+        self.lines_to_next_level = LINES_PER_LEVEL
+
+        # Accélérer la chute des pièces
+        # Plus le level est élevé, plus la vitesse de descente est rapide
+        self.gravity = gravity_for_level(self.level)
+        self.tracer.instant("level_up", "engine", {"level": self.level})
+
+    def move_piece(self, dx, dy):
+        original_pos = self.piece["position"]
+        self.piece["position"] = (self.piece["position"][0] + dx, self.piece["position"][1] + dy)
+
+        if self.check_collision(self.piece):
+            # Annuler le mouvement s'il y a collision
+            self.piece["position"] = original_pos
+
+            # Si la collision est vers le bas, figer la pièce
+            if dy > 0:
+                tracer = self.tracer
+                start = tracer.now()
+                touched_rows = self.lock_piece()
+                tracer.complete("lock", start, category="engine")
+
+                # Vérifier et supprimer les lignes complètes
+                start = tracer.now()
+                result = self.clear_lines(touched_rows)
+                if result.rows:
+                    tracer.complete("line_clear", start, category="engine",
+                                    args={"lines": len(result.rows)})
+
+                # Ajouter le score de descente rapide
+                self.score += self.soft_drop_score
+
+                # Passer à la prochaine pièce
+                self.piece = self.make_piece(self.next_pieces.pop().name)
+
+                # Réinitialiser le soft drop et la gravité accumulée
+                self.soft_drop = False
+                self.soft_drop_score = 0
+                self.gravity_acc = 0
+
+                # Vérifier la fin du jeu
+                if self.check_collision(self.piece):
+                    self.game_over = True
+
+    def lock_piece(self):
+        # Figer la pièce dans la grille et mettre à jour hauteurs, compteurs
+        # de lignes et trous ; retourne les lignes touchées par la pièce
+        piece_x, piece_y = self.piece["position"]
+        color = self.piece["color"]
+        heights = self.heights
+        added_height = 0
+        added_cells = 0
+        touched_rows = []
+
+        for x, y in self.piece["shape"]:
+            grid_x = piece_x + x
+            grid_y = piece_y + y
+            if 0 <= grid_y < GRID_HEIGHT:
+                self.rows[grid_y] |= 1 << grid_x
+                self.grid[grid_y][grid_x] = color
+                self.board_hash ^= CELL_KEYS[grid_y][grid_x]
+                self.row_fill[grid_y] += 1
+                added_cells += 1
+                if grid_y not in touched_rows:
+                    touched_rows.append(grid_y)
+
+                height = GRID_HEIGHT - grid_y
+                if height > heights[grid_x]:
+                    added_height += height - heights[grid_x]
+                    heights[grid_x] = height
+
+        # Trous = somme des hauteurs - cases remplies
+        self.holes += added_height - added_cells
+        self.board_version += 1
+        touched_rows.sort()
+        return touched_rows
+
+    def update_heights_after_clear(self, lines_cleared):
+        # Les lignes supprimées étaient pleines : chaque colonne perd
+        # lines_cleared de hauteur, puis descend encore si son sommet est un trou
+        heights = self.heights
+        rows = self.rows
+        removed_height = 0
+        for x in range(GRID_WIDTH):
+            old_height = heights[x]
+            height = old_height - lines_cleared
+            bit = 1 << x
+            while height > 0 and not rows[GRID_HEIGHT - height] & bit:
+                height -= 1
+            heights[x] = height
+            removed_height += old_height - height
+
+        self.holes += GRID_WIDTH * lines_cleared - removed_height
+
+    def state_hash(self):
+        # Hash de l'état complet : grille, pièce active et file des prochaines pièces
+        return self.board_hash ^ piece_hash(self.piece) ^ queue_hash(self.next_pieces)
+
+    def drop_distance(self):
+        # Nombre de lignes dont la pièce peut descendre, calculé avec les
+        # hauteurs de colonnes (en O(largeur de la pièce))
+        orientation = ORIENTATIONS[self.piece["name"]][self.piece["rotation"]]
+        piece_x, piece_y = self.piece["position"]
+        left = piece_x + orientation.min_x
+        distance = GRID_HEIGHT
+
+        for i, bottom in enumerate(orientation.bottom):
+            surface = GRID_HEIGHT - self.heights[left + i]
+            lowest = piece_y + bottom
+            if lowest >= surface:
+                # Pièce glissée sous un surplomb : descendre ligne par ligne
+                return self.drop_distance_slow()
+            distance = min(distance, surface - 1 - lowest)
+        return distance
+
+    def drop_distance_slow(self):
+        piece_x, piece_y = self.piece["position"]
+        ghost = dict(self.piece)
+        distance = 0
+        while True:
+            ghost["position"] = (piece_x, piece_y + distance + 1)
+            if self.check_collision(ghost):
+                return distance
+            distance += 1
+
+    def hard_drop(self):
+        # Poser la pièce directement à sa position finale
+        piece_x, piece_y = self.piece["position"]
+        self.piece["position"] = (piece_x, piece_y + self.drop_distance())
+        self.move_piece(0, 1)
+
+    def rotate_piece(self):
+        # Rotation = orientation suivante dans la table précalculée
+        original_rotation = self.piece["rotation"]
+        self.piece["rotation"] = (original_rotation + 1) % 4
+
+        if self.check_collision(self.piece):
+            # Annuler la rotation s'il y a collision
+            self.piece["rotation"] = original_rotation
+        else:
+            self.piece["shape"] = ORIENTATIONS[self.piece["name"]][self.piece["rotation"]].cells
+
+    def drop(self, rows=1):
+        # Descente automatique de rows lignes en un seul déplacement, avec les
+        # points du soft drop. Comme pour une descente d'une ligne, la pièce
+        # ne se fige que si elle reposait déjà au début de la descente.
+        distance = self.drop_distance()
+        if distance == 0:
+            self.move_piece(0, 1)
+            return
+
+        lines_dropped = min(rows, distance)
+        piece_x, piece_y = self.piece["position"]
+        self.piece["position"] = (piece_x, piece_y + lines_dropped)
+
+        if self.soft_drop:
+            self.score += lines_dropped
+
+    def tick(self):
+        # Un tick de simulation : ajouter la gravité du tick et descendre
+        # d'autant de lignes entières qu'accumulé
+        gravity = self.gravity
+        if self.soft_drop:
+            gravity = min(GRAVITY_20G, gravity * self.soft_drop_factor)
+
+        self.gravity_acc += gravity
+        rows = self.gravity_acc >> 16
+        if rows:
+            self.gravity_acc &= GRAVITY_ONE - 1
+            self.drop(rows)
+
+    def rebuild_board_stats(self):
+        # Recalculer depuis le bitboard tout ce qui est tenu à jour pas à pas
+        self.row_fill = [bin(row).count("1") for row in self.rows]
+        self.heights = [0] * GRID_WIDTH
+        for x in range(GRID_WIDTH):
+            bit = 1 << x
+            for y, row in enumerate(self.rows):
+                if row & bit:
+                    self.heights[x] = GRID_HEIGHT - y
+                    break
+        self.holes = sum(self.heights) - sum(self.row_fill)
+        self.board_hash = board_hash(self.rows)
+        self.board_version += 1
+
+    def snapshot(self):
+        queue = bytes(piece.index for piece in self.next_pieces)
+        rng_state, remembered = self.randomizer.getstate()
+        colors = 0
+        for y, row in enumerate(self.grid):
+            if self.rows[y]:
+                shift = 3 * GRID_WIDTH * y
+                for x, color in enumerate(row):
+                    if color != 0:
+                        colors |= COLOR_CODES[color] << (shift + 3 * x)
+
+        piece_x, piece_y = self.piece["position"]
+        return SNAPSHOT_FORMAT.pack(
+            SNAPSHOT_VERSION,
+            self.game_over | (self.soft_drop << 1),
+            PIECE_TYPES[self.piece["name"]].index, self.piece["rotation"], piece_x, piece_y,
+            len(queue), queue.ljust(SNAPSHOT_PREVIEW_SLOTS, bytes([NO_PIECE])),
+            self.score, self.total_lines_cleared, self.level, self.lines_to_next_level,
+            self.soft_drop_score, self.gravity_acc,
+            self.randomizer.KIND, rng_state,
+            bytes(remembered).ljust(SNAPSHOT_RANDOMIZER_SLOTS, bytes([NO_PIECE])),
+            colors.to_bytes(SNAPSHOT_GRID_BYTES, "little")
+        )
+
+    def restore(self, data):
+        values = SNAPSHOT_FORMAT.unpack(data)
+        if values[0] != SNAPSHOT_VERSION:
+            raise ValueError("Version de sauvegarde inconnue : %d" % values[0])
+
+        (_, flags, piece_index, rotation, piece_x, piece_y, queue_length, queue,
+         self.score, self.total_lines_cleared, self.level, self.lines_to_next_level,
+         self.soft_drop_score, self.gravity_acc,
+         kind, rng_state, remembered, colors) = values
+        self.game_over = bool(flags & 1)
+        self.soft_drop = bool(flags & 2)
+        self.gravity = gravity_for_level(self.level)
+
+        # Reprendre le même type de générateur, au même point de sa suite
+        if kind != self.randomizer.KIND:
+            self.randomizer = RANDOMIZERS[kind]()
+        self.randomizer.setstate((rng_state, [index for index in remembered if index != NO_PIECE]))
+
+        self.piece = self.make_piece(PIECE_NAMES[piece_index], rotation, (piece_x, piece_y))
+        # La longueur de la file vient de la sauvegarde (et vaut pour les
+        # prochaines parties, comme l'argument preview_length)
+        self.preview_length = queue_length
+        self.next_pieces.randomizer = self.randomizer
+        self.next_pieces.fill(PIECE_TYPES[PIECE_NAMES[index]] for index in queue[:queue_length])
+
+        # Grille et bitboard reconstruits depuis les codes de couleur
+        colors = int.from_bytes(colors, "little")
+        self.grid = []
+        self.rows = []
+        for y in range(GRID_HEIGHT):
+            codes = colors >> (3 * GRID_WIDTH * y)
+            row = [CODE_COLORS[(codes >> (3 * x)) & 7] for x in range(GRID_WIDTH)]
+            self.grid.append(row)
+            self.rows.append(sum(1 << x for x, color in enumerate(row) if color != 0))
+        self.rebuild_board_stats()
+        self.last_clear = None
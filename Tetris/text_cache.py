@@ -0,0 +1,93 @@
+from collections import OrderedDict
+
+import pygame
+
+from constants import BLACK
+
+class TextCache:
+    # Cache LRU des textes rendus : (police, texte, couleur) -> surface.
+    # Les textes du jeu changent rarement, un rendu de police par image
+    # devient une simple recherche dans un dictionnaire.
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.surfaces)
+
+class NumberDisplay:
+    # Compteur "Label: 1234" centré sur un point. Les chiffres sont des
+    # sprites de même largeur : quand la valeur change sans changer de nombre
+    # de chiffres, seuls les chiffres modifiés sont redessinés.
+    def __init__(self, label, font, color, cache, background=BLACK):
+        self.label = cache.render(font, label, color)
+        self.digits = {digit: cache.render(font, digit, color) for digit in "0123456789-"}
+        self.digit_width = max(sprite.get_width() for sprite in self.digits.values())
+        self.height = max(self.label.get_height(), font.get_height())
+        self.background = background
+        self.text = None
+        self.center = None
+        self.rect = None
+
+    def digit_rect(self, i):
+        return pygame.Rect(self.rect.x + self.label.get_width() + i * self.digit_width,
+                           self.rect.y, self.digit_width, self.height)
+
+    def blit_digit(self, surface, i, digit):
+        rect = self.digit_rect(i)
+        sprite = self.digits[digit]
+        surface.blit(sprite, (rect.x + (self.digit_width - sprite.get_width()) // 2, rect.y))
+        return rect
+
+    def draw(self, surface, value, center, full=False):
+        # Dessiner la valeur ; retourne les zones modifiées
+        text = str(value)
+        if not full and text == self.text and center == self.center:
+            return []
+
+        if full or self.text is None or len(text) != len(self.text) or center != self.center:
+            # Nombre de chiffres différent : effacer et tout recentrer
+            rects = []
+            if not full and self.rect is not None:
+                surface.fill(self.background, self.rect)
+                rects.append(self.rect)
+            width = self.label.get_width() + len(text) * self.digit_width
+            self.rect = pygame.Rect(center[0] - width // 2, center[1] - self.height // 2,
+                                    width, self.height)
+            surface.fill(self.background, self.rect)
+            surface.blit(self.label, (self.rect.x, self.rect.y + (self.height - self.label.get_height()) // 2))
+            for i, digit in enumerate(text):
+                self.blit_digit(surface, i, digit)
+            rects.append(self.rect)
+        else:
+            rects = []
+            for i, (old, new) in enumerate(zip(self.text, text)):
+                if old != new:
+                    surface.fill(self.background, self.digit_rect(i))
+                    rects.append(self.blit_digit(surface, i, new))
+
+        self.text = text
+        self.center = center
+        return rects
@@ -0,0 +1,35 @@
+import pygame
+
+from constants import CELL_SIZE, PREVIEW_CELL_SIZE, SHAPES_COLORS, DARK_GRAY, WHITE
+
+# Bordure des cases selon leur taille : grise dans la grille, blanche dans
+# la prévisualisation des prochaines pièces
+TILE_BORDERS = {CELL_SIZE: DARK_GRAY, PREVIEW_CELL_SIZE: WHITE}
+
+def render_tile(color, size, border):
+    # Case pleine avec une bordure de 1 pixel
+    tile = pygame.Surface((size, size))
+    tile.fill(color)
+    pygame.draw.rect(tile, border, (0, 0, size, size), 1)
+    return tile
+
+class TileAtlas:
+    # Une surface pré-rendue par couleur et par taille de case, convertie au
+    # format de l'écran (l'affichage doit déjà être ouvert). Changer de thème
+    # revient à construire l'atlas avec une autre fonction render.
+    def __init__(self, colors=None, borders=TILE_BORDERS, render=render_tile):
+        if colors is None:
+            colors = SHAPES_COLORS.values()
+        self.tiles = {}
+        for size, border in borders.items():
+            for color in colors:
+                self.tiles[(color, size)] = render(color, size, border).convert()
+
+    def tile(self, color, size=CELL_SIZE):
+        return self.tiles[(color, size)]
+
+    def cells(self, cells, color, origin=(0, 0), size=CELL_SIZE):
+        # Liste (surface, position) de cases d'une même couleur, pour Surface.blits
+        tile = self.tiles[(color, size)]
+        origin_x, origin_y = origin
+        return [(tile, (origin_x + x * size, origin_y + y * size)) for x, y in cells]
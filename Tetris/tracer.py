@@ -0,0 +1,114 @@
+# Export des intervalles de la boucle de jeu au format "trace event" de
+# Chrome (JSON), lisible dans chrome://tracing ou Perfetto.
+# Les événements sont gardés en mémoire sous forme de tuples ; quand le
+# tampon est plein, il est passé tel quel à un fil d'écriture qui le formate
+# et l'écrit. Dans la boucle de jeu, enregistrer un intervalle ne coûte qu'un
+# appel à perf_counter_ns et un append, même quand le tampon est vidé.
+
+import json
+import os
+import queue
+import threading
+import time
+
+class Tracer:
+    enabled = True
+
+    def __init__(self, path, flush_every=2000):
+        self.path = path
+        self.flush_every = flush_every
+        self.origin = time.perf_counter_ns()
+        self.pid = os.getpid()
+        self.tid = threading.get_ident()
+        self.events = []
+        self.quoted = {}  # Noms et catégories déjà encodés en JSON
+        self.file = open(path, "w", buffering=1 << 16)
+        self.file.write("[\n")
+        self.file.write(self.format(("M", "process_name", "__metadata", 0, 0, {"name": "Tetris"})))
+
+        # Tampons pleins à formater et écrire (None : fin de la trace)
+        self.pending = queue.Queue()
+        self.writer = threading.Thread(target=self.write_events, daemon=True)
+        self.writer.start()
+
+    def now(self):
+        return time.perf_counter_ns()
+
+    def complete(self, name, start_ns, end_ns=None, category="frame", args=None):
+        # Intervalle terminé (événement "X") de start_ns à end_ns (par défaut maintenant)
+        if end_ns is None:
+            end_ns = time.perf_counter_ns()
+        self.events.append(("X", name, category, start_ns, end_ns - start_ns, args))
+        if len(self.events) >= self.flush_every:
+            self.flush()
+
+    def instant(self, name, category="game", args=None):
+        # Événement ponctuel (événement "i")
+        self.events.append(("i", name, category, time.perf_counter_ns(), 0, args))
+        if len(self.events) >= self.flush_every:
+            self.flush()
+
+    def quote(self, text):
+        quoted = self.quoted.get(text)
+        if quoted is None:
+            quoted = self.quoted[text] = json.dumps(text)
+        return quoted
+
+    def format(self, event):
+        # Une ligne JSON par événement, écrite à la main (json.dumps sur un
+        # dictionnaire par événement est plusieurs fois plus lent)
+        phase, name, category, start_ns, duration_ns, args = event
+        text = '{"name":%s,"cat":%s,"ph":"%s","ts":%.3f,"pid":%d,"tid":%d' % (
+            self.quote(name), self.quote(category), phase,
+            (start_ns - self.origin) / 1000, self.pid, self.tid)
+        if phase == "X":
+            text += ',"dur":%.3f' % (duration_ns / 1000)
+        elif phase == "i":
+            text += ',"s":"t"'
+        if args:
+            text += ',"args":' + json.dumps(args, separators=(",", ":"))
+        return text + "}"
+
+    def flush(self):
+        # Passer le tampon au fil d'écriture, sans le formater ici
+        if self.events:
+            self.pending.put(self.events)
+            self.events = []
+
+    def write_events(self):
+        while True:
+            events = self.pending.get()
+            if events is None:
+                break
+            self.file.write("".join(",\n" + self.format(event) for event in events))
+
+    def close(self):
+        # Attendre que tout soit écrit, puis fermer le tableau JSON
+        if self.file.closed:
+            return
+        self.flush()
+        self.pending.put(None)
+        self.writer.join()
+        self.file.write("\n]\n")
+        self.file.close()
+
+class NullTracer:
+    # Traceur désactivé : mêmes méthodes, sans effet
+    enabled = False
+
+    def now(self):
+        return 0
+
+    def complete(self, name, start_ns, end_ns=None, category="frame", args=None):
+        pass
+
+    def instant(self, name, category="game", args=None):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+NULL_TRACER = NullTracer()
@@ -1,686 +1,723 @@
-import pygame
-import random
-import sys
-
-# Paramètres de la grille de jeu
-GRID_WIDTH = 10
-GRID_HEIGHT = 20
-CELL_SIZE = 30  # Taille de chaque cellule (en pixels)
-PREVIEW_CELL_SIZE = 20  # Taille des cellules pour la prévisualisation
-
-# Définir les couleurs
-WHITE = (255, 255, 255)
-BLACK = (0, 0, 0)
-RED = (255, 0, 0)
-GREEN = (0, 255, 0)
-BLUE = (0, 0, 255)
-CYAN = (0, 255, 255)
-MAGENTA = (255, 0, 255)
-YELLOW = (255, 255, 0)
-ORANGE = (255, 165, 0)
-GRAY = (128, 128, 128)
-DARK_GRAY = (64, 64, 64)
-
-# Les formes des pièces (tetriminos)
-SHAPES = {
-    "I": [(0, 1), (1, 1), (2, 1), (3, 1)],
-    "O": [(0, 0), (1, 0), (0, 1), (1, 1)],
-    "T": [(0, 1), (1, 0), (1, 1), (2, 1)],
-    "L": [(0, 0), (0, 1), (1, 1), (2, 1)],
-    "J": [(2, 0), (0, 1), (1, 1), (2, 1)],
-    "S": [(0, 1), (1, 1), (1, 0), (2, 0)],
-    "Z": [(0, 0), (1, 0), (1, 1), (2, 1)]
-}
-
-# Les couleurs des pièces
-SHAPES_COLORS = {
-    "I": CYAN,
-    "O": YELLOW,
-    "T": MAGENTA,
-    "L": ORANGE,
-    "J": BLUE,
-    "S": GREEN,
-    "Z": RED
-}
-
-def get_high_score():
-    try:
-        with open('high_score.txt', 'r') as file:
-            return int(file.read().strip())
-    except (FileNotFoundError, ValueError):
-        return 0
-
-def save_high_score(score):
-    with open('high_score.txt', 'w') as file:
-        file.write(str(score))
-
-class Button:
-    def __init__(self, x, y, width, height, text, color, text_color):
-        self.rect = pygame.Rect(x, y, width, height)
-        self.text = text
-        self.color = color
-        self.text_color = text_color
-        self.font = pygame.font.Font(None, 36)
-
-    def draw(self, screen):
-        pygame.draw.rect(screen, self.color, self.rect)
-        text_surface = self.font.render(self.text, True, self.text_color)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
-
-    def is_clicked(self, pos):
-        return self.rect.collidepoint(pos)
-
-class Tetris:
-    def __init__(self):
-        pygame.init()
-        pygame.mixer.init()
-        
-        # Configuration de l'écran
-        self.game_width = GRID_WIDTH * CELL_SIZE
-        self.preview_width = 6 * PREVIEW_CELL_SIZE
-        self.width = self.game_width + self.preview_width
-        self.height = GRID_HEIGHT * CELL_SIZE
-        self.screen = pygame.display.set_mode((self.width, self.height + 50))  # Espace supplémentaire pour le score
-        pygame.display.set_caption("Tetris")
-        self.soft_drop = False
-        self.soft_drop_score = 0
-        self.soft_drop_speed = 50
-        
-        # Police pour les stats
-        self.stats_font = pygame.font.Font(None, 36)
-
-        # Initialiser le high score
-        self.high_score = get_high_score()
-
-        # Nouvelles statistiques
-        self.total_lines_cleared = 0
-        self.level = 1
-        self.lines_to_next_level = 10
-        
-        # Initialiser la vitesse de base
-        self.base_drop_speed = 500
-        # Initialiser le reste du jeu
-        self.reset_game()
-        
-        # Charger la musique
-        try:
-            pygame.mixer.music.load("tetris_theme.mp3")  # Assurez-vous d'avoir un fichier MP3 de musique Tetris
-            pygame.mixer.music.set_volume(0.5)
-            pygame.mixer.music.play(-1)  # Jouer en boucle
-        except pygame.error:
-            print("Erreur de chargement de la musique. Assurez-vous que le fichier tetris_theme.mp3 existe.")
-        
-        # Variables du jeu
-        self.grid = self.create_empty_grid()
-        self.piece = self.generate_piece()
-        self.next_pieces = [self.generate_piece() for _ in range(3)]  # 3 prochaines pièces
-        self.score = 0
-        self.clock = pygame.time.Clock()
-        self.game_over = False
-        
-        # Variables de contrôle
-        self.drop_time = 0
-        self.drop_speed = 500  # Temps en millisecondes entre chaque descente automatique
-        self.last_drop_time = pygame.time.get_ticks()
-
-        self.move_left = False
-        self.move_right = False
-        self.move_delay = 200  # Initial delay before rapid movement
-        self.move_interval = 50  # Interval between movements after initial delay
-        self.last_move_time = 0
-        self.move_cooldown = 0
-
-    def show_start_menu(self):
-        # Créer les boutons
-        start_button = Button(
-            self.width // 2 - 100, 
-            self.height // 2 - 100, 
-            200, 50, 
-            "Start", 
-            GREEN, 
-            WHITE
-        )
-        
-        high_score_button = Button(
-            self.width // 2 - 100, 
-            self.height // 2, 
-            200, 50, 
-            "High Score", 
-            BLUE, 
-            WHITE
-        )
-        
-        exit_button = Button(
-            self.width // 2 - 100, 
-            self.height // 2 + 100, 
-            200, 50, 
-            "Exit", 
-            RED, 
-            WHITE
-        )
-        
-        while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if start_button.is_clicked(event.pos):
-                        return "start"
-                    elif high_score_button.is_clicked(event.pos):
-                        return "high_score"
-                    elif exit_button.is_clicked(event.pos):
-                        return "exit"
-            
-            # Nettoyer l'écran
-            self.screen.fill(BLACK)
-            
-            # Titre du jeu
-            title_text = self.stats_font.render("TETRIS", True, CYAN)
-            title_rect = title_text.get_rect(center=(self.width // 2, self.height // 2 - 200))
-            self.screen.blit(title_text, title_rect)
-            
-            # Dessiner les boutons
-            start_button.draw(self.screen)
-            high_score_button.draw(self.screen)
-            exit_button.draw(self.screen)
-            
-            pygame.display.update()
-            pygame.time.Clock().tick(30)
-
-    def show_high_score_menu(self):
-        back_button = Button(
-            self.width // 2 - 100, 
-            self.height // 2 + 100, 
-            200, 50, 
-            "Back", 
-            BLUE, 
-            WHITE
-        )
-        
-        while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if back_button.is_clicked(event.pos):
-                        return
-            
-            # Nettoyer l'écran
-            self.screen.fill(BLACK)
-            
-            # Titre High Score
-            title_text = self.font.render("High Score", True, YELLOW)
-            title_rect = title_text.get_rect(center=(self.width // 2, self.height // 2 - 200))
-            self.screen.blit(title_text, title_rect)
-            
-            # Afficher le high score
-            score_text = self.font.render(f"{self.high_score}", True, WHITE)
-            score_rect = score_text.get_rect(center=(self.width // 2, self.height // 2))
-            self.screen.blit(score_text, score_rect)
-            
-            # Dessiner le bouton retour
-            back_button.draw(self.screen)
-            
-            pygame.display.update()
-            pygame.time.Clock().tick(30)
-
-    def reset_game(self):
-        self.grid = self.create_empty_grid()
-        self.piece = self.generate_piece()
-        self.next_pieces = [self.generate_piece() for _ in range(3)]
-        self.score = 0
-        self.clock = pygame.time.Clock()
-        self.game_over = False
-        
-        # Variables de contrôle
-        self.drop_time = 0
-        self.drop_speed = 500  # Temps en millisecondes entre chaque descente automatique
-        self.last_drop_time = pygame.time.get_ticks()
-
-        self.move_left = False
-        self.move_right = False
-        self.move_delay = 200
-        self.move_interval = 50
-        self.last_move_time = 0
-        self.move_cooldown = 0
-        
-        self.soft_drop = False
-        self.soft_drop_score = 0
-        self.soft_drop_speed = 50
-
-        self.total_lines_cleared = 0
-        self.level = 1
-        self.lines_to_next_level = 10
-        
-        # Réinitialiser la vitesse de descente
-        self.drop_speed = self.base_drop_speed
-        
-    # [Tous les autres méthodes restent identiques]
-    def create_empty_grid(self):
-        return [[0 for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
-    
-    def generate_piece(self):
-        shape_name = random.choice(list(SHAPES.keys()))
-        shape = SHAPES[shape_name]
-        color = SHAPES_COLORS[shape_name]
-        return {"shape": shape, "position": (GRID_WIDTH // 2 - 1, 0), "color": color}
-    
-    def rotate(self, shape):
-        return [(y, -x) for x, y in shape]
-    
-    def check_collision(self, piece):
-        for x, y in piece["shape"]:
-            new_x = piece["position"][0] + x
-            new_y = piece["position"][1] + y
-            if (new_x < 0 or new_x >= GRID_WIDTH or 
-                new_y >= GRID_HEIGHT or 
-                (new_y >= 0 and self.grid[new_y][new_x] != 0)):
-                return True
-        return False
-    
-    def clear_lines(self):
-        # Trouver les lignes complètes
-        lines_to_clear = [i for i, row in enumerate(self.grid) if all(cell != 0 for cell in row)]
-        
-        # Supprimer les lignes complètes
-        for i in lines_to_clear:
-            self.grid.pop(i)
-            self.grid.insert(0, [0] * GRID_WIDTH)
-        
-        # Calculer le nombre de lignes complétées
-        lines_cleared = len(lines_to_clear)
-        
-        # Mettre à jour le nombre total de lignes complétées
-        self.total_lines_cleared += lines_cleared
-        
-        # Calculer le score
-        score_multipliers = {0: 0, 1: 100, 2: 300, 3: 500, 4: 800}
-        self.score += score_multipliers.get(lines_cleared, 1200)
-        
-        # Gérer le passage de level
-        self.lines_to_next_level -= lines_cleared
-        
-        # Augmenter le level si nécessaire
-        if self.lines_to_next_level <= 0:
-            self.level_up()
-    
-    def draw_grid(self):
-        # Fill the entire grid background with black
-        self.screen.fill(BLACK)
-        
-        # Draw the grid with gray borders
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH):
-                # Draw the cell color or black for empty cells
-                cell_color = self.grid[y][x] if self.grid[y][x] != 0 else BLACK
-                pygame.draw.rect(self.screen, cell_color, 
-                                (x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
-                
-                # Draw gray border for each cell
-                pygame.draw.rect(self.screen, DARK_GRAY, 
-                                (x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE), 1)
-    
-    def draw_piece(self, piece):
-        for x, y in piece["shape"]:
-            pygame.draw.rect(self.screen, piece["color"], 
-                            ((piece["position"][0] + x) * CELL_SIZE, 
-                            (piece["position"][1] + y) * CELL_SIZE, 
-                            CELL_SIZE, CELL_SIZE))
-            # Add dark gray border to each piece block
-            pygame.draw.rect(self.screen, DARK_GRAY, 
-                            ((piece["position"][0] + x) * CELL_SIZE, 
-                            (piece["position"][1] + y) * CELL_SIZE, 
-                            CELL_SIZE, CELL_SIZE), 1)
-    
-    def level_up(self):
-        # Augmenter le level
-        self.level += 1
-        
-        # Réinitialiser les lignes pour le prochain level
-        self.lines_to_next_level = 10
-        
-        # Accélérer la chute des pièces
-        # Plus le level est élevé, plus la vitesse de descente est rapide
-        # Diminuer le drop_speed de 10% à chaque level
-        self.drop_speed = max(50, int(self.base_drop_speed * (0.9 ** (self.level - 1))))
-        
-        # Option: rendre le soft drop aussi plus rapide
-        self.soft_drop_speed = max(25, int(self.soft_drop_speed * (0.9 ** (self.level - 1))))
-
-    def draw_score(self):
-        # Nettoyer la zone de score
-        pygame.draw.rect(self.screen, BLACK, (0, self.height, self.width, 50))
-        
-        # Position pour centrer les statistiques
-        center_x = self.width // 2
-        
-        # Créer les surfaces de texte avec la nouvelle police
-        level_text = self.stats_font.render(f"Level: {self.level}", True, CYAN)
-        lines_text = self.stats_font.render(f"Lines: {self.total_lines_cleared}", True, GREEN)
-        score_text = self.stats_font.render(f"Score: {self.score}", True, WHITE)
-        
-        # Positionner les textes de manière espacée
-        level_rect = level_text.get_rect(center=(center_x - 150, self.height + 25))
-        lines_rect = lines_text.get_rect(center=(center_x, self.height + 25))
-        score_rect = score_text.get_rect(center=(center_x + 150, self.height + 25))
-        
-        # Dessiner les textes
-        self.screen.blit(level_text, level_rect)
-        self.screen.blit(lines_text, lines_rect)
-        self.screen.blit(score_text, score_rect)
-
-    
-    def move_piece(self, dx, dy):
-        original_pos = self.piece["position"]
-        self.piece["position"] = (self.piece["position"][0] + dx, self.piece["position"][1] + dy)
-        
-        if self.check_collision(self.piece):
-            # Annuler le mouvement s'il y a collision
-            self.piece["position"] = original_pos
-            
-            # Si la collision est vers le bas, figer la pièce
-            if dy > 0:
-                for x, y in self.piece["shape"]:
-                    grid_x = self.piece["position"][0] + x
-                    grid_y = self.piece["position"][1] + y
-                    if 0 <= grid_y < GRID_HEIGHT:
-                        self.grid[grid_y][grid_x] = self.piece["color"]
-                
-                # Vérifier et supprimer les lignes complètes
-                self.clear_lines()
-                
-                # Générer une nouvelle pièce
-                self.piece = self.generate_piece()
-                
-                # Vérifier la fin du jeu
-                if self.check_collision(self.piece):
-                    self.game_over = True
-    
-    def rotate_piece(self):
-        original_shape = self.piece["shape"]
-        self.piece["shape"] = self.rotate(self.piece["shape"])
-        
-        if self.check_collision(self.piece):
-            # Annuler la rotation s'il y a collision
-            self.piece["shape"] = original_shape
-    
-    def handle_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return False
-            
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_LEFT:
-                    self.move_left = True
-                    self.move_right = False
-                    self.last_move_time = pygame.time.get_ticks()
-                elif event.key == pygame.K_RIGHT:
-                    self.move_right = True
-                    self.move_left = False
-                    self.last_move_time = pygame.time.get_ticks()
-                elif event.key == pygame.K_DOWN:
-                    self.soft_drop = True
-                elif event.key == pygame.K_UP:
-                    self.rotate_piece()
-            
-            if event.type == pygame.KEYUP:
-                if event.key == pygame.K_LEFT:
-                    self.move_left = False
-                elif event.key == pygame.K_RIGHT:
-                    self.move_right = False
-                elif event.key == pygame.K_DOWN:
-                    self.soft_drop = False
-                    self.soft_drop_score = 0
-        
-        return True
-    
-    def run(self):
-        while True:
-            # Afficher le menu de démarrage
-            menu_choice = self.show_start_menu()
-            
-            if menu_choice == "exit":
-                pygame.quit()
-                sys.exit()
-            
-            if menu_choice == "high_score":
-                # Afficher l'écran du high score
-                self.show_high_score_menu()
-                continue
-            
-            # Si "start" est choisi, commencer une partie
-            while True:  # Boucle principale pour permettre le replay
-                # Réinitialiser le jeu avant chaque partie
-                self.reset_game()
-                
-                # Jouer une partie
-                while not self.game_over:
-                    if not self.handle_events():
-                        pygame.quit()
-                        sys.exit()
-                    
-                    current_time = pygame.time.get_ticks()
-                    move_time = self.move_delay if self.move_cooldown == 0 else self.move_interval
-                    
-                    if (self.move_left or self.move_right) and current_time - self.last_move_time > move_time:
-                        if self.move_left:
-                            self.move_piece(-1, 0)
-                        elif self.move_right:
-                            self.move_piece(1, 0)
-                        
-                        self.last_move_time = current_time
-                        self.move_cooldown = 1
-                    
-                    drop_interval = self.soft_drop_speed if self.soft_drop else self.drop_speed
-                    
-                    if current_time - self.last_drop_time > drop_interval:
-                        original_y = self.piece["position"][1]
-                        self.move_piece(0, 1)
-                        
-                        if self.soft_drop:
-                            lines_dropped = self.piece["position"][1] - original_y
-                            self.score += lines_dropped
-                        
-                        self.last_drop_time = current_time
-                    
-                    self.screen.fill(BLACK)
-                    self.draw_grid()
-                    self.draw_piece(self.piece)
-                    self.draw_score()
-                    self.draw_preview_pieces()
-                    
-                    pygame.display.update()
-                    self.clock.tick(60)
-                
-                # Afficher l'écran de game over et attendre un replay
-                if self.show_game_over():
-                    continue  # Recommencer une nouvelle partie
-                else:
-                    break  # Retourner au menu principal
-    
-    def show_game_over(self):
-        # Mettre à jour le high score si nécessaire
-        if self.score > self.high_score:
-            self.high_score = self.score
-            save_high_score(self.high_score)
-        
-        # Créer le bouton replay
-        replay_button = Button(
-            self.width // 2 - 100, 
-            self.height // 2 + 100, 
-            200, 50, 
-            "Replay", 
-            GREEN, 
-            WHITE
-        )
-        
-        while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if replay_button.is_clicked(event.pos):
-                        return True  # Signal pour redémarrer le jeu
-                
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_r:
-                        return True  # Redémarrer avec la touche R
-            
-            self.screen.fill(BLACK)
-            
-            # Texte Game Over
-            game_over_text = self.stats_font.render("Game Over", True, RED)
-            score_text = self.stats_font.render(f"Score: {self.score}", True, WHITE)
-            high_score_text = self.stats_font.render(f"High Score: {self.high_score}", True, YELLOW)
-            
-            self.screen.blit(game_over_text, (self.width // 2 - game_over_text.get_width() // 2, self.height // 2 - 100))
-            self.screen.blit(score_text, (self.width // 2 - score_text.get_width() // 2, self.height // 2 - 50))
-            self.screen.blit(high_score_text, (self.width // 2 - high_score_text.get_width() // 2, self.height // 2))
-            
-            # Dessiner le bouton replay
-            replay_button.draw(self.screen)
-            
-            pygame.display.update()
-            self.clock.tick(30)
-
-    def draw_preview_pieces(self):
-        # Dessiner le titre "Next"
-        next_text = self.stats_font.render("Next", True, WHITE)
-        self.screen.blit(next_text, (self.game_width + 10, 10))
-        
-        # Dessiner les 3 prochaines pièces
-        for i, next_piece in enumerate(self.next_pieces):
-            # Position de prévisualisation avec plus d'espace
-            start_x = self.game_width + (self.preview_width - 4 * PREVIEW_CELL_SIZE) // 2
-            start_y = 100 + i * 120  # Augmenter l'espacement vertical
-            
-            # Dessiner le cadre de prévisualisation
-            pygame.draw.rect(self.screen, DARK_GRAY, 
-                             (self.game_width, start_y - 20, self.preview_width, 100), 2)
-            
-            # Dessiner la pièce
-            for x, y in next_piece["shape"]:
-                pygame.draw.rect(self.screen, next_piece["color"], 
-                                 (start_x + x * PREVIEW_CELL_SIZE, 
-                                  start_y + y * PREVIEW_CELL_SIZE, 
-                                  PREVIEW_CELL_SIZE, PREVIEW_CELL_SIZE))
-                pygame.draw.rect(self.screen, WHITE, 
-                                 (start_x + x * PREVIEW_CELL_SIZE, 
-                                  start_y + y * PREVIEW_CELL_SIZE, 
-                                  PREVIEW_CELL_SIZE, PREVIEW_CELL_SIZE), 1)
-    
-    def move_piece(self, dx, dy):
-        original_pos = self.piece["position"]
-        self.piece["position"] = (self.piece["position"][0] + dx, self.piece["position"][1] + dy)
-        
-        if self.check_collision(self.piece):
-            # Annuler le mouvement s'il y a collision
-            self.piece["position"] = original_pos
-            
-            # Si la collision est vers le bas, figer la pièce
-            if dy > 0:
-                for x, y in self.piece["shape"]:
-                    grid_x = self.piece["position"][0] + x 
-                    grid_y = self.piece["position"][1] + y 
-                    if 0 <= grid_y < GRID_HEIGHT:
-                        self.grid[grid_y][grid_x] = self.piece["color"]
-                
-                # Vérifier et supprimer les lignes complètes
-                self.clear_lines()
-                
-                # Ajouter le score de descente rapide
-                self.score += self.soft_drop_score
-                
-                # Passer à la prochaine pièce
-                self.piece = self.next_pieces.pop(0)
-                self.piece["position"] = (GRID_WIDTH // 2 - 1, 0)
-                
-                # Réinitialiser le soft drop
-                self.soft_drop = False
-                self.soft_drop_score = 0
-                
-                # Générer une nouvelle pièce pour la prévisualisation
-                self.next_pieces.append(self.generate_piece())
-                
-                # Vérifier la fin du jeu
-                if self.check_collision(self.piece):
-                    self.game_over = True
-    
-    def run(self):
-        while True:
-            # Afficher le menu de démarrage
-            menu_choice = self.show_start_menu()
-            
-            if menu_choice == "exit":
-                pygame.quit()
-                sys.exit()
-            
-            if menu_choice == "high_score":
-                # Afficher l'écran du high score
-                self.show_high_score_menu()
-                continue
-            
-            # Si "start" est choisi, commencer une partie
-            while True:  # Boucle principale pour permettre le replay
-                # Réinitialiser le jeu avant chaque partie
-                self.reset_game()
-                
-                # Jouer une partie
-                while not self.game_over:
-                    if not self.handle_events():
-                        pygame.quit()
-                        sys.exit()
-                    
-                    current_time = pygame.time.get_ticks()
-                    move_time = self.move_delay if self.move_cooldown == 0 else self.move_interval
-                    
-                    if (self.move_left or self.move_right) and current_time - self.last_move_time > move_time:
-                        if self.move_left:
-                            self.move_piece(-1, 0)
-                        elif self.move_right:
-                            self.move_piece(1, 0)
-                        
-                        self.last_move_time = current_time
-                        self.move_cooldown = 1
-                    
-                    drop_interval = self.soft_drop_speed if self.soft_drop else self.drop_speed
-                    
-                    if current_time - self.last_drop_time > drop_interval:
-                        original_y = self.piece["position"][1]
-                        self.move_piece(0, 1)
-                        
-                        if self.soft_drop:
-                            lines_dropped = self.piece["position"][1] - original_y
-                            self.score += lines_dropped
-                        
-                        self.last_drop_time = current_time
-                    
-                    self.screen.fill(BLACK)
-                    self.draw_grid()
-                    self.draw_piece(self.piece)
-                    self.draw_score()
-                    self.draw_preview_pieces()
-                    
-                    pygame.display.update()
-                    self.clock.tick(60)
-                
-                # Afficher l'écran de game over et attendre un replay
-                if self.show_game_over():
-                    continue  # Recommencer une nouvelle partie
-                else:
-                    break  # Retourner au menu principal
-
-# Le reste du code reste identique
-def main():
-    game = Tetris()
-    game.run()
-
-if __name__ == "__main__":
-    main()
+import time
+
+# Instant du lancement, pour le rapport de démarrage (--startup-report)
+START_NS = time.perf_counter_ns()
+
+import argparse
+import pygame
+import sys
+
+from constants import (
+    GRID_WIDTH, GRID_HEIGHT, CELL_SIZE, PREVIEW_CELL_SIZE,
+    WHITE, BLACK, RED, GREEN, BLUE, CYAN, YELLOW, GRAY, DARK_GRAY
+)
+from assets import ASSETS, ASSETS_LOADED
+from audio import Audio, NullAudio, AUDIO_READY
+from profiler import FrameProfiler
+from text_cache import TextCache, NumberDisplay
+from tiles import TileAtlas
+from tracer import Tracer, NULL_TRACER
+from input_handler import InputHandler, DAS_MS, ARR_MS, SOFT_DROP_FACTOR
+from simulation import Simulation
+from tetris_engine import TetrisEngine
+
+def get_high_score():
+    try:
+        with open('high_score.txt', 'r') as file:
+            return int(file.read().strip())
+    except (FileNotFoundError, ValueError):
+        return 0
+
+def save_high_score(score):
+    with open('high_score.txt', 'w') as file:
+        file.write(str(score))
+
+# Touches du jeu et actions correspondantes pour la simulation
+KEY_ACTIONS = {
+    pygame.K_LEFT: "left",
+    pygame.K_RIGHT: "right",
+    pygame.K_DOWN: "down",
+    pygame.K_UP: "rotate",
+    pygame.K_SPACE: "hard_drop",
+}
+
+# Les menus attendent les événements au lieu de tourner à 30 images par
+# seconde : ils ne sont redessinés qu'au survol, au clic ou quand la fenêtre
+# doit être repeinte, et se réveillent au plus toutes les MENU_WAIT_MS
+MENU_WAIT_MS = 1000
+MENU_REDRAW_EVENTS = (
+    pygame.VIDEORESIZE,
+    pygame.VIDEOEXPOSE,
+    pygame.WINDOWEXPOSED,
+    pygame.WINDOWRESIZED,
+    pygame.WINDOWRESTORED,
+)
+
+# Touches de pause, et états ACTIVEEVENT qui mettent le jeu en pause quand
+# ils sont perdus (focus clavier, fenêtre visible)
+PAUSE_KEYS = (pygame.K_p, pygame.K_ESCAPE)
+BACKGROUND_STATES = 2 | 4  # APPINPUTFOCUS | APPACTIVE
+
+class Button:
+    def __init__(self, x, y, width, height, text, color, text_color):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.text = text
+        self.color = color
+        self.text_color = text_color
+        self.font = ASSETS.font(36)
+        # Le texte du bouton ne change pas : le rendre une seule fois
+        self.text_surface = self.font.render(self.text, True, self.text_color)
+
+        self.hovered = False
+
+    def update_hover(self, pos):
+        # Retourne True si le survol a changé (le menu doit être redessiné)
+        hovered = self.rect.collidepoint(pos)
+        changed = hovered != self.hovered
+        self.hovered = hovered
+        return changed
+
+    def draw(self, screen):
+        # Couleur éclaircie quand la souris survole le bouton
+        color = tuple(min(255, c + 60) for c in self.color) if self.hovered else self.color
+        pygame.draw.rect(screen, color, self.rect)
+        text_rect = self.text_surface.get_rect(center=self.rect.center)
+        screen.blit(self.text_surface, text_rect)
+
+    def is_clicked(self, pos):
+        return self.rect.collidepoint(pos)
+
+class Tetris:
+    def __init__(self, das=DAS_MS, arr=ARR_MS, soft_drop_factor=SOFT_DROP_FACTOR, profile_dump=None,
+                 trace=None, audio=True, startup_report=False):
+        # Démarrage rapide : seulement l'affichage et les polices. Le son est
+        # initialisé en arrière-plan après la première image (NullAudio sans
+        # périphérique audio ou avec --no-audio)
+        self.startup_report = startup_report
+        self.startup_times = []
+        pygame.display.init()
+        pygame.font.init()
+        self.audio = Audio(on_ready=self.report_audio) if audio else NullAudio()
+        self.mark_startup("pygame")
+        
+        # Configuration de l'écran
+        self.game_width = GRID_WIDTH * CELL_SIZE
+        self.preview_width = 6 * PREVIEW_CELL_SIZE
+        self.width = self.game_width + self.preview_width
+        self.height = GRID_HEIGHT * CELL_SIZE
+        self.screen = pygame.display.set_mode((self.width, self.height + 50))  # Espace supplémentaire pour le score
+        pygame.display.set_caption("Tetris")
+        self.mark_startup("display")
+        
+        # Police pour les stats, textes rendus gardés en cache et compteurs
+        # du bas de l'écran (seuls les chiffres modifiés sont redessinés)
+        self.stats_font = ASSETS.font(36)
+        self.text_cache = TextCache()
+        self.counters = (
+            NumberDisplay("Level: ", self.stats_font, CYAN, self.text_cache),
+            NumberDisplay("Lines: ", self.stats_font, GREEN, self.text_cache),
+            NumberDisplay("Score: ", self.stats_font, WHITE, self.text_cache),
+        )
+
+        # Initialiser le high score
+        self.high_score = get_high_score()
+
+        # Moteur de jeu (grille, pièces, score, level) et boucle à pas fixe
+        self.engine = TetrisEngine()
+        # Répétition des déplacements (DAS/ARR en millisecondes, ARR = 0 : jusqu'au mur)
+        self.simulation = Simulation(self.engine, InputHandler(das, arr, soft_drop_factor))
+        
+        # Cases pré-rendues de chaque couleur, pour la grille et la prévisualisation
+        self.tiles = TileAtlas()
+        
+        # Grille vide dessinée une seule fois, et surface de la pile (grille
+        # + pièces posées) redessinée seulement quand la grille change
+        self.background = self.build_background()
+        self.stack_surface = pygame.Surface((self.game_width, self.height)).convert()
+        self.stack_version = None
+        self.stack_rows = [None] * GRID_HEIGHT  # Contenu de chaque ligne déjà dessinée
+        self.mark_startup("tiles")
+        
+        # La musique est chargée plus tard : quand le préchargement des
+        # ressources se termine (menu affiché) ou au début de la partie
+        self.music_started = False
+        
+        self.clock = pygame.time.Clock()
+
+        # Mesure des phases de chaque image ; F3 affiche les percentiles
+        self.profiler = FrameProfiler()
+        self.profile_dump = profile_dump  # Fichier CSV/JSON écrit en quittant
+        self.show_profiler = False
+        self.profiler_font = ASSETS.font(20)
+        self.profiler_stats = None
+        
+        # Trace au format Chrome (optionnelle) : phases, menus, moteur
+        self.tracer = Tracer(trace) if trace else NULL_TRACER
+        self.profiler.tracer = self.tracer
+        self.engine.tracer = self.tracer
+
+        # Initialiser le reste du jeu
+        self.reset_game()
+        self.mark_startup("init")
+        self.first_frame = True
+    
+    def mark_startup(self, phase):
+        # Temps écoulé depuis le lancement à la fin de chaque phase du démarrage
+        self.startup_times.append((phase, time.perf_counter_ns() - START_NS))
+    
+    def report_startup(self):
+        # Première image affichée : fin du démarrage
+        self.mark_startup("first_frame")
+        self.tracer.complete("startup", START_NS, category="startup")
+        if self.startup_report:
+            previous = 0
+            for phase, elapsed in self.startup_times:
+                print("démarrage %-12s %8.1f ms  (+%.1f ms)" % (phase, elapsed / 1e6, (elapsed - previous) / 1e6))
+                previous = elapsed
+    
+    def report_audio(self, audio):
+        # Appelé par le fil du son quand le mixer est prêt (ou indisponible)
+        if self.startup_report:
+            state = "prêt" if audio.available else "indisponible"
+            print("démarrage %-12s %8.1f ms  (mixer %s en %.1f ms, en arrière-plan)" % (
+                "audio", (time.perf_counter_ns() - START_NS) / 1e6, state, audio.ready_ns / 1e6))
+
+    def show_start_menu(self):
+        # Créer les boutons
+        start_button = Button(
+            self.width // 2 - 100, 
+            self.height // 2 - 100, 
+            200, 50, 
+            "Start", 
+            GREEN, 
+            WHITE
+        )
+        
+        high_score_button = Button(
+            self.width // 2 - 100, 
+            self.height // 2, 
+            200, 50, 
+            "High Score", 
+            BLUE, 
+            WHITE
+        )
+        
+        exit_button = Button(
+            self.width // 2 - 100, 
+            self.height // 2 + 100, 
+            200, 50, 
+            "Exit", 
+            RED, 
+            WHITE
+        )
+        
+        buttons = (start_button, high_score_button, exit_button)
+        for button in buttons:
+            button.update_hover(pygame.mouse.get_pos())
+        
+        redraw = True
+        while True:
+            if redraw:
+                draw_start = self.tracer.now()
+                
+                # Nettoyer l'écran
+                self.screen.fill(BLACK)
+                
+                # Titre du jeu
+                title_text = self.text_cache.render(self.stats_font, "TETRIS", CYAN)
+                title_rect = title_text.get_rect(center=(self.width // 2, self.height // 2 - 200))
+                self.screen.blit(title_text, title_rect)
+                
+                # Dessiner les boutons
+                start_button.draw(self.screen)
+                high_score_button.draw(self.screen)
+                exit_button.draw(self.screen)
+                
+                pygame.display.update()
+                self.tracer.complete("show_start_menu", draw_start, category="menu")
+                
+                # Le menu est affiché : charger les ressources et ouvrir le
+                # son en arrière-plan
+                if self.first_frame:
+                    self.first_frame = False
+                    self.report_startup()
+                ASSETS.preload()
+                self.audio.start()
+            
+            events, redraw = self.wait_menu_events(buttons)
+            for event in events:
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    if start_button.is_clicked(event.pos):
+                        return "start"
+                    elif high_score_button.is_clicked(event.pos):
+                        return "high_score"
+                    elif exit_button.is_clicked(event.pos):
+                        return "exit"
+
+    def show_high_score_menu(self):
+        back_button = Button(
+            self.width // 2 - 100, 
+            self.height // 2 + 100, 
+            200, 50, 
+            "Back", 
+            BLUE, 
+            WHITE
+        )
+        
+        back_button.update_hover(pygame.mouse.get_pos())
+        
+        redraw = True
+        while True:
+            if redraw:
+                # Nettoyer l'écran
+                self.screen.fill(BLACK)
+                
+                # Titre High Score
+                title_text = self.text_cache.render(self.stats_font, "High Score", YELLOW)
+                title_rect = title_text.get_rect(center=(self.width // 2, self.height // 2 - 200))
+                self.screen.blit(title_text, title_rect)
+                
+                # Afficher le high score
+                score_text = self.text_cache.render(self.stats_font, f"{self.high_score}", WHITE)
+                score_rect = score_text.get_rect(center=(self.width // 2, self.height // 2))
+                self.screen.blit(score_text, score_rect)
+                
+                # Dessiner le bouton retour
+                back_button.draw(self.screen)
+                
+                pygame.display.update()
+            
+            events, redraw = self.wait_menu_events((back_button,))
+            for event in events:
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    if back_button.is_clicked(event.pos):
+                        return
+
+    def wait_menu_events(self, buttons, timeout=MENU_WAIT_MS):
+        # Bloquer jusqu'au prochain événement (au plus timeout ms) sans
+        # consommer de CPU ; retourne les événements reçus et s'il faut
+        # redessiner le menu (survol d'un bouton, fenêtre à repeindre).
+        # Une animation passe le délai jusqu'à sa prochaine étape en timeout.
+        event = pygame.event.wait(timeout)
+        events = [] if event.type == pygame.NOEVENT else [event] + pygame.event.get()
+        
+        redraw = False
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.quit()
+            
+            if event.type == pygame.MOUSEMOTION:
+                for button in buttons:
+                    if button.update_hover(event.pos):
+                        redraw = True
+            
+            if event.type in MENU_REDRAW_EVENTS:
+                redraw = True
+            
+            if event.type == ASSETS_LOADED:
+                self.start_music()
+            
+            if event.type == AUDIO_READY:
+                self.audio.play_pending()
+        return events, redraw
+    
+    def start_music(self):
+        # Jouer la musique en boucle (une seule fois par lancement)
+        if self.music_started:
+            return
+        self.music_started = True
+        self.audio.play_music("theme", 0.5)  # Assurez-vous d'avoir un fichier MP3 de musique Tetris
+
+    def reset_game(self):
+        self.engine.reset()
+        # La partie commence maintenant (horloge haute résolution)
+        self.simulation.reset(time.perf_counter_ns())
+        self.clock = pygame.time.Clock()
+        
+        # Zones modifiées à envoyer à l'écran ; la première image est complète.
+        # Les clés retiennent ce qui est affiché (pièce, score, file) pour ne
+        # redessiner que ce qui a changé.
+        self.full_redraw = True
+        self.dirty_rects = []
+        self.paused = False
+        self.minimized = False
+        self.restored_rects = []
+        self.piece_key = None
+        self.piece_rect = None
+        self.score_key = None
+        self.preview_key = None
+
+    def build_background(self):
+        # Fond noir et bordure grise de chaque case
+        background = pygame.Surface((self.game_width, self.height)).convert()
+        background.fill(BLACK)
+        for y in range(GRID_HEIGHT):
+            for x in range(GRID_WIDTH):
+                pygame.draw.rect(background, DARK_GRAY, 
+                                (x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE), 1)
+        return background
+    
+    def update_stack_surface(self):
+        # Redessiner les lignes de la pile qui ont changé, seulement après une
+        # pose, des lignes effacées ou une nouvelle partie ; retourne ces lignes
+        if self.stack_version == self.engine.board_version:
+            return []
+        self.stack_version = self.engine.board_version
+        
+        changed_rows = [y for y, row in enumerate(self.engine.grid) if row != self.stack_rows[y]]
+        tiles = self.tiles.tiles
+        for y in changed_rows:
+            row = self.engine.grid[y]
+            self.stack_rows[y] = list(row)
+            row_rect = (0, y * CELL_SIZE, self.game_width, CELL_SIZE)
+            self.stack_surface.blit(self.background, row_rect, row_rect)
+            self.stack_surface.blits([(tiles[(cell_color, CELL_SIZE)], (x * CELL_SIZE, y * CELL_SIZE))
+                                      for x, cell_color in enumerate(row) if cell_color != 0],
+                                     doreturn=False)
+        return changed_rows
+    
+    def get_piece_key(self, piece):
+        return piece["name"], piece["rotation"], piece["position"]
+    
+    def draw_grid(self):
+        # Grille et pièces posées, copiées depuis la surface de la pile : en
+        # entier pour une image complète, sinon seulement les lignes changées
+        # et l'ancienne place de la pièce si elle a bougé
+        changed_rows = self.update_stack_surface()
+        if self.full_redraw:
+            self.screen.blit(self.stack_surface, (0, 0))
+            self.restored_rects = []
+            return
+        
+        restored = [pygame.Rect(0, y * CELL_SIZE, self.game_width, CELL_SIZE) for y in changed_rows]
+        if self.piece_rect is not None and self.get_piece_key(self.engine.piece) != self.piece_key:
+            restored.append(self.piece_rect)
+        for rect in restored:
+            self.screen.blit(self.stack_surface, rect, rect)
+        self.dirty_rects.extend(restored)
+        self.restored_rects = restored
+    
+    def draw_piece(self, piece):
+        piece_x, piece_y = piece["position"]
+        blits = self.tiles.cells(piece["shape"], piece["color"],
+                                 (piece_x * CELL_SIZE, piece_y * CELL_SIZE))
+        rect = pygame.Rect(blits[0][1], (CELL_SIZE, CELL_SIZE)).unionall(
+            [pygame.Rect(position, (CELL_SIZE, CELL_SIZE)) for _, position in blits[1:]])
+        
+        # Pièce immobile et pas effacée par draw_grid : rien à faire
+        key = self.get_piece_key(piece)
+        if not self.full_redraw and key == self.piece_key and rect.collidelist(self.restored_rects) == -1:
+            return
+        
+        self.screen.blits(blits, doreturn=False)
+        self.piece_key = key
+        self.piece_rect = rect
+        if not self.full_redraw:
+            self.dirty_rects.append(rect)
+    
+    def update_display(self):
+        # Envoyer à l'écran l'image entière ou seulement les zones modifiées
+        if self.full_redraw:
+            pygame.display.update()
+            self.full_redraw = False
+        elif self.dirty_rects:
+            pygame.display.update(self.dirty_rects)
+        self.dirty_rects = []
+    
+    def draw_score(self):
+        # Redessiner seulement quand un des nombres change
+        key = (self.engine.level, self.engine.total_lines_cleared, self.engine.score)
+        if not self.full_redraw and key == self.score_key:
+            return
+        self.score_key = key
+        
+        # Image complète : nettoyer toute la zone de score
+        if self.full_redraw:
+            pygame.draw.rect(self.screen, BLACK, (0, self.height, self.width, 50))
+        
+        # Compteurs espacés autour du centre
+        center_x = self.width // 2
+        for i, (counter, value) in enumerate(zip(self.counters, key)):
+            rects = counter.draw(self.screen, value, (center_x - 150 + i * 150, self.height + 25),
+                                 self.full_redraw)
+            if not self.full_redraw:
+                self.dirty_rects.extend(rects)
+
+    def handle_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+            
+            # Horodater chaque touche en nanosecondes pour le DAS/ARR
+            if event.type == pygame.KEYDOWN and event.key in KEY_ACTIONS:
+                self.simulation.press(KEY_ACTIONS[event.key], time.perf_counter_ns())
+            
+            if event.type == pygame.KEYUP and event.key in KEY_ACTIONS:
+                self.simulation.release(KEY_ACTIONS[event.key], time.perf_counter_ns())
+            
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.show_profiler = not self.show_profiler
+                self.full_redraw = True
+            
+            # Pause : touche P / Échap, perte du focus ou fenêtre réduite
+            if event.type == pygame.KEYDOWN and event.key in PAUSE_KEYS:
+                self.paused = True
+            if event.type in (pygame.WINDOWFOCUSLOST, pygame.WINDOWMINIMIZED):
+                self.paused = True
+            if event.type == pygame.ACTIVEEVENT and event.gain == 0 and event.state & BACKGROUND_STATES:
+                self.paused = True
+            if event.type == pygame.WINDOWMINIMIZED:
+                self.minimized = True
+            
+            if event.type == AUDIO_READY:
+                self.audio.play_pending()
+        
+        return True
+    
+    def wait_while_paused(self):
+        # Pause sans consommer de CPU : la simulation est gelée, l'écran
+        # n'est dessiné qu'une fois (et pas du tout si la fenêtre est
+        # réduite), et on bloque sur les événements jusqu'à la reprise
+        pause_start = self.tracer.now()
+        self.simulation.pause(time.perf_counter_ns())
+        
+        redraw = True
+        while self.paused:
+            if redraw and not self.minimized:
+                self.draw_pause_screen()
+            redraw = False
+            
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                self.quit()
+            elif event.type == pygame.KEYDOWN and event.key in PAUSE_KEYS:
+                self.paused = False
+            elif event.type == pygame.WINDOWMINIMIZED:
+                self.minimized = True
+            elif event.type == AUDIO_READY:
+                self.audio.play_pending()
+            elif event.type in (pygame.WINDOWRESTORED, pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                self.minimized = False
+                redraw = True
+        
+        self.simulation.resume(time.perf_counter_ns())
+        self.full_redraw = True
+        self.tracer.complete("pause", pause_start, category="menu")
+    
+    def draw_pause_screen(self):
+        # Image de jeu redessinée entièrement, assombrie, avec le texte de pause
+        self.full_redraw = True
+        self.draw_grid()
+        self.draw_piece(self.engine.piece)
+        self.draw_score()
+        self.draw_preview_pieces()
+        
+        shade = pygame.Surface((self.width, self.height + 50))
+        shade.set_alpha(160)
+        shade.fill(BLACK)
+        self.screen.blit(shade, (0, 0))
+        
+        paused_text = self.text_cache.render(self.stats_font, "Paused", WHITE)
+        hint_text = self.text_cache.render(self.stats_font, "Press P to resume", GRAY)
+        self.screen.blit(paused_text, (self.width // 2 - paused_text.get_width() // 2, self.height // 2 - 40))
+        self.screen.blit(hint_text, (self.width // 2 - hint_text.get_width() // 2, self.height // 2 + 10))
+        self.update_display()
+    
+    def draw_profiler_overlay(self):
+        # Percentiles recalculés toutes les 30 images pour que l'affichage reste léger
+        if self.profiler_stats is None or self.profiler.count % 30 == 0:
+            self.profiler_stats = self.profiler.stats()
+        stats = self.profiler_stats
+        
+        # Une ligne par phase : nom puis colonnes p50 / p95 / p99
+        rows = [("phase (ms)", "p50", "p95", "p99")]
+        for name in self.profiler.phases + ("frame",):
+            rows.append((name,) + tuple("%.2f" % value for value in stats[name]))
+        rows.append(("budget %.1f ms, reste (p95) %.2f ms"
+                     % (self.profiler.budget_ms, self.profiler.budget_left(stats)),))
+        
+        line_height = self.profiler_font.get_linesize()
+        background = pygame.Surface((self.width, line_height * len(rows) + 10))
+        background.set_alpha(200)
+        background.fill(BLACK)
+        self.screen.blit(background, (0, 0))
+        for i, row in enumerate(rows):
+            for j, cell in enumerate(row):
+                text = self.text_cache.render(self.profiler_font, cell, WHITE)
+                self.screen.blit(text, (5 + (165 + (j - 1) * 50 if j else 0), 5 + i * line_height))
+    
+    def quit(self):
+        # Écrire les mesures des images si demandé, puis quitter
+        if self.profile_dump:
+            self.profiler.dump(self.profile_dump)
+        self.tracer.close()
+        pygame.quit()
+        sys.exit()
+    
+    def show_game_over(self):
+        # Mettre à jour le high score si nécessaire
+        if self.engine.score > self.high_score:
+            self.high_score = self.engine.score
+            save_high_score(self.high_score)
+        
+        # Créer le bouton replay
+        replay_button = Button(
+            self.width // 2 - 100, 
+            self.height // 2 + 100, 
+            200, 50, 
+            "Replay", 
+            GREEN, 
+            WHITE
+        )
+        
+        replay_button.update_hover(pygame.mouse.get_pos())
+        
+        redraw = True
+        while True:
+            if redraw:
+                draw_start = self.tracer.now()
+                self.screen.fill(BLACK)
+                
+                # Texte Game Over
+                game_over_text = self.text_cache.render(self.stats_font, "Game Over", RED)
+                score_text = self.text_cache.render(self.stats_font, f"Score: {self.engine.score}", WHITE)
+                high_score_text = self.text_cache.render(self.stats_font, f"High Score: {self.high_score}", YELLOW)
+                
+                self.screen.blit(game_over_text, (self.width // 2 - game_over_text.get_width() // 2, self.height // 2 - 100))
+                self.screen.blit(score_text, (self.width // 2 - score_text.get_width() // 2, self.height // 2 - 50))
+                self.screen.blit(high_score_text, (self.width // 2 - high_score_text.get_width() // 2, self.height // 2))
+                
+                # Dessiner le bouton replay
+                replay_button.draw(self.screen)
+                
+                pygame.display.update()
+                self.tracer.complete("show_game_over", draw_start, category="menu")
+            
+            events, redraw = self.wait_menu_events((replay_button,))
+            for event in events:
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    if replay_button.is_clicked(event.pos):
+                        return True  # Signal pour redémarrer le jeu
+                
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_r:
+                        return True  # Redémarrer avec la touche R
+
+    def draw_preview_pieces(self):
+        # Redessiner seulement quand la file des prochaines pièces change
+        key = tuple(piece.name for piece in self.engine.next_pieces)
+        if not self.full_redraw and key == self.preview_key:
+            return
+        self.preview_key = key
+        
+        preview_area = pygame.Rect(self.game_width, 0, self.preview_width, self.height)
+        self.screen.fill(BLACK, preview_area)
+        if not self.full_redraw:
+            self.dirty_rects.append(preview_area)
+        
+        # Dessiner le titre "Next"
+        next_text = self.text_cache.render(self.stats_font, "Next", WHITE)
+        self.screen.blit(next_text, (self.game_width + 10, 10))
+        
+        # Dessiner les 3 prochaines pièces
+        for i, next_piece in enumerate(self.engine.next_pieces):
+            # Position de prévisualisation avec plus d'espace
+            start_x = self.game_width + (self.preview_width - 4 * PREVIEW_CELL_SIZE) // 2
+            start_y = 100 + i * 120  # Augmenter l'espacement vertical
+            
+            # Dessiner le cadre de prévisualisation
+            pygame.draw.rect(self.screen, DARK_GRAY, 
+                             (self.game_width, start_y - 20, self.preview_width, 100), 2)
+            
+            # Dessiner la pièce
+            self.screen.blits(self.tiles.cells(next_piece.orientations[0].cells, next_piece.color,
+                                               (start_x, start_y), PREVIEW_CELL_SIZE),
+                              doreturn=False)
+    
+    def run(self):
+        while True:
+            # Afficher le menu de démarrage
+            menu_choice = self.show_start_menu()
+            
+            if menu_choice == "exit":
+                self.quit()
+            
+            if menu_choice == "high_score":
+                # Afficher l'écran du high score
+                self.show_high_score_menu()
+                continue
+            
+            # Si "start" est choisi, commencer une partie (avec la musique,
+            # si le préchargement ne l'a pas déjà lancée)
+            self.start_music()
+            while True:  # Boucle principale pour permettre le replay
+                # Réinitialiser le jeu avant chaque partie
+                self.reset_game()
+                
+                # Jouer une partie
+                while not self.engine.game_over:
+                    if self.paused:
+                        self.wait_while_paused()
+                    
+                    profiler = self.profiler
+                    profiler.start_frame()
+                    if not self.handle_events():
+                        self.quit()
+                    profiler.mark("handle_events")
+                    
+                    # Faire avancer la logique d'autant de ticks fixes que
+                    # le temps réel écoulé depuis le début de la partie
+                    self.simulation.advance(time.perf_counter_ns())
+                    profiler.mark("update")
+                    
+                    # Le calque des mesures est transparent : avec lui, tout redessiner
+                    if self.show_profiler:
+                        self.full_redraw = True
+                    self.draw_grid()
+                    profiler.mark("draw_grid")
+                    self.draw_piece(self.engine.piece)
+                    profiler.mark("draw_piece")
+                    self.draw_score()
+                    profiler.mark("draw_score")
+                    self.draw_preview_pieces()
+                    profiler.mark("draw_preview_pieces")
+                    if self.show_profiler:
+                        self.draw_profiler_overlay()
+                    profiler.mark("overlay")
+                    
+                    self.update_display()
+                    profiler.mark("display_update")
+                    profiler.end_frame()
+                    self.clock.tick(60)
+                
+                # Afficher l'écran de game over et attendre un replay
+                if self.show_game_over():
+                    continue  # Recommencer une nouvelle partie
+                else:
+                    break  # Retourner au menu principal
+
+def main():
+    parser = argparse.ArgumentParser(description="Tetris")
+    parser.add_argument("--das", type=float, default=DAS_MS,
+                        help="délai avant répétition d'un déplacement (ms)")
+    parser.add_argument("--arr", type=float, default=ARR_MS,
+                        help="intervalle de répétition (ms), 0 pour aller au mur")
+    parser.add_argument("--soft-drop-factor", type=int, default=SOFT_DROP_FACTOR,
+                        help="multiplicateur de gravité pendant le soft drop")
+    parser.add_argument("--profile-dump", metavar="FICHIER",
+                        help="écrire la durée des phases de chaque image en quittant (.csv ou .json)")
+    parser.add_argument("--trace", metavar="FICHIER",
+                        help="enregistrer une trace Chrome (chrome://tracing, Perfetto)")
+    parser.add_argument("--no-audio", action="store_true",
+                        help="ne pas initialiser le son (machines sans périphérique audio)")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="afficher la durée de chaque phase du démarrage")
+    args = parser.parse_args()
+    
+    game = Tetris(das=args.das, arr=args.arr, soft_drop_factor=args.soft_drop_factor,
+                  profile_dump=args.profile_dump, trace=args.trace,
+                  audio=not args.no_audio, startup_report=args.startup_report)
+    game.run()
+
+if __name__ == "__main__":
+    main()
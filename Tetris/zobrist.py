@@ -0,0 +1,93 @@
+import random
+from collections import OrderedDict, namedtuple
+
+from constants import GRID_WIDTH, GRID_HEIGHT, SHAPES
+from orientations import X_OFFSET
+
+# Hachage de Zobrist : une clé aléatoire de 64 bits par case, par état de la
+# pièce active et par pièce de la file. Le hash d'un état est le XOR des
+# clés présentes, ce qui permet de le mettre à jour par petites touches.
+
+# Graine fixe : les hash restent les mêmes d'une exécution à l'autre
+_rng = random.Random(0x7E7815)
+
+def _key():
+    return _rng.getrandbits(64)
+
+MAX_QUEUE = 16
+
+CELL_KEYS = [[_key() for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
+PIECE_KEYS = {
+    name: [[[_key() for _ in range(GRID_HEIGHT)]
+            for _ in range(GRID_WIDTH + X_OFFSET)]
+           for _ in range(4)]
+    for name in SHAPES
+}
+QUEUE_KEYS = [{name: _key() for name in SHAPES} for _ in range(MAX_QUEUE)]
+
+def _build_row_hashes(y):
+    # Hash de chaque contenu possible de la ligne y (2 ** GRID_WIDTH masques)
+    hashes = [0] * (1 << GRID_WIDTH)
+    for mask in range(1, 1 << GRID_WIDTH):
+        low_bit = mask & -mask
+        hashes[mask] = hashes[mask ^ low_bit] ^ CELL_KEYS[y][low_bit.bit_length() - 1]
+    return hashes
+
+ROW_HASHES = [_build_row_hashes(y) for y in range(GRID_HEIGHT)]
+
+def board_hash(rows):
+    value = 0
+    for y, row in enumerate(rows):
+        value ^= ROW_HASHES[y][row]
+    return value
+
+def piece_hash(piece):
+    x, y = piece["position"]
+    if not 0 <= x + X_OFFSET < GRID_WIDTH + X_OFFSET or not 0 <= y < GRID_HEIGHT:
+        return 0
+    return PIECE_KEYS[piece["name"]][piece["rotation"]][x + X_OFFSET][y]
+
+def queue_hash(next_pieces):
+    value = 0
+    for keys, piece in zip(QUEUE_KEYS, next_pieces):
+        value ^= keys[piece.name]
+    return value
+
+# Entrée de la table de transposition : évaluation et meilleur placement
+CacheEntry = namedtuple("CacheEntry", ["score", "placement"])
+
+class TranspositionCache:
+    # Cache LRU hash -> (évaluation, meilleur placement), limité en taille,
+    # partagé entre les recherches et les images successives
+    def __init__(self, max_size=100000):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, score, placement=None):
+        self.entries[key] = CacheEntry(score, placement)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0